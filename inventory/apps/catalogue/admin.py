@@ -13,11 +13,23 @@ class ItemInfoAdmin(admin.ModelAdmin):
     list_display = ['id','item_code', 'item_name', 'category', 'active']
     list_filter = ['category', 'resource_type', 'active']
     search_fields = ['item_code', 'item_name', 'tags']
+    ordering = ['item_name']
     inlines = [ItemAttributeInline]  # This is where ItemAttribute belongs!
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The changelist only renders list_display; skip the tags TEXT column there
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_display)
+        return queryset
+
 
 @admin.register(ItemAttribute)
 class ItemAttributeAdmin(admin.ModelAdmin):
     list_display = ['id', 'item_info', 'key', 'datatype']
     list_filter = ['datatype']
-    search_fields = ['item__item_name', 'key']
\ No newline at end of file
+    list_select_related = ['item_info']
+    search_fields = ['item_info__item_name', 'key']
+    ordering = ['item_info', 'key']
+    autocomplete_fields = ['item_info']
\ No newline at end of file
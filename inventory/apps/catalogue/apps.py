@@ -1,7 +1,25 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import pre_migrate
+
+
+def create_trigram_extension(using, **kwargs):
+    """
+    The catalogue and departments gin_trgm_ops indexes need pg_trgm. Runs
+    before every migrate, including the syncdb that builds the test
+    database under backend.test_settings, where no migration would add it
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
 
 
 class CatalogueConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.catalogue'
     verbose_name = 'Item Catalogue'
+
+    def ready(self):
+        import apps.catalogue.signals
+        pre_migrate.connect(create_trigram_extension, sender=self)
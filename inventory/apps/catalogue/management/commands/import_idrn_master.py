@@ -1,15 +1,42 @@
 # apps/catalogue/management/commands/import_idrn_master.py
 
 import csv
+import io
+import queue
+import threading
+from itertools import islice
 from pathlib import Path
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 from apps.catalogue.models import ItemInfo
+from backend.csv_import import header_positions
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pac
+except ImportError:  # optional: fall back to the stdlib csv module
+    pa = pac = None
 
 
 class Command(BaseCommand):
     help = "Import IDRN Master Items from CSV (S.No, Item Code, Item Name, Activity, Resource Type, Category)"
 
+    REQUIRED_COLUMNS = frozenset({
+        'S.No', 'Item Code', 'Item Name', 'Activity Name', 'Resource Type', 'Category Name',
+    })
+    CHUNK_SIZE = 2000
+    BATCH_SIZE = 1000
+    QUEUE_SIZE = 4
+    UPDATE_FIELDS = [
+        'item_name', 'activity_name', 'resource_type', 'category',
+        'unit', 'perishability', 'tags', 'active', 'updated_at',
+    ]
+    COPY_COLUMNS = [
+        'item_code', 'item_name', 'activity_name', 'resource_type',
+        'category', 'tags', 'active', 'updated_at',
+    ]
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--file',
@@ -41,54 +68,171 @@ class Command(BaseCommand):
                 ItemInfo.objects.all().delete()
             self.stdout.write("Cleared.")
 
-        created = 0
-        updated = 0
+        processed = 0
         skipped = 0
 
+        # A full reload can stream rows with COPY instead of parameterized INSERTs
+        use_copy = clear_first and connection.vendor == 'postgresql'
+        copied = set()
+
         with open(csv_path, newline='', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            raw_header = next(reader, [])
+            if pac is not None:
+                reader = self.arrow_rows(csv_path, raw_header)
 
-            # Normalize headers
-            reader.fieldnames = [name.strip() for name in reader.fieldnames]
-            self.stdout.write(f"Headers: {reader.fieldnames}")
+            idx = header_positions(raw_header, self.REQUIRED_COLUMNS)
+            self.stdout.write(f"Headers: {list(idx)}")
 
-            required = {'S.No', 'Item Code', 'Item Name', 'Activity Name', 'Resource Type', 'Category Name'}
-            if not required.issubset(set(reader.fieldnames)):
-                missing = required - set(reader.fieldnames)
-                raise ValueError(f"Missing required columns: {missing}")
+            ic, nm, act, rt, cat = (
+                idx['Item Code'], idx['Item Name'], idx['Activity Name'],
+                idx['Resource Type'], idx['Category Name'],
+            )
 
-            with transaction.atomic():
-                for row in reader:
-                    item_code = row['Item Code'].strip()
-                    if not item_code:
-                        skipped += 1
-                        continue
-
-                    defaults = {
-                        'item_name': row['Item Name'].strip(),
-                        'activity_name': row['Activity Name'].strip(),
-                        'resource_type': row['Resource Type'].strip(),
-                        'category': row['Category Name'].strip(),
-                        'unit': None,
-                        'perishability': None,
-                        'tags': f"{row['Activity Name'].strip()},{row['Resource Type'].strip()},{row['Category Name'].strip()}",
-                        'active': True,
-                    }
-
-                    obj, created_flag = ItemInfo.objects.update_or_create(
-                        item_code=item_code,
-                        defaults=defaults
-                    )
-                    if created_flag:
-                        created += 1
-                    else:
-                        updated += 1
+            # Parse in this thread while a worker flushes finished chunks, so
+            # CSV parsing overlaps with database round-trips
+            batches = queue.Queue(maxsize=self.QUEUE_SIZE)
+            errors = []
+            worker = threading.Thread(
+                target=self.flush_worker, args=(batches, use_copy, errors)
+            )
+            worker.start()
+
+            try:
+                while True:
+                    chunk = list(islice(reader, self.CHUNK_SIZE))
+                    if not chunk:
+                        break
+
+                    # Keyed by item_code: ON CONFLICT cannot touch the same row twice
+                    objs = {}
+                    for row in chunk:
+                        if not row:
+                            # csv.reader yields [] for blank lines (DictReader skipped them)
+                            continue
+                        item_code = row[ic].strip()
+                        if not item_code:
+                            skipped += 1
+                            continue
+                        activity_name = row[act].strip()
+                        resource_type = row[rt].strip()
+                        category = row[cat].strip()
+                        objs[item_code] = ItemInfo(
+                            item_code=item_code,
+                            item_name=row[nm].strip(),
+                            activity_name=activity_name,
+                            resource_type=resource_type,
+                            category=category,
+                            unit=None,
+                            perishability=None,
+                            tags=f"{activity_name},{resource_type},{category}",
+                            active=True,
+                        )
+
+                    # Table was just emptied, so COPY has no conflicts to resolve,
+                    # except codes repeated from an earlier chunk: those go through
+                    # the upsert so the last row wins, as on a normal import
+                    repeated = []
+                    if use_copy:
+                        repeated = [objs.pop(item_code) for item_code in copied.intersection(objs)]
+                        copied.update(objs)
+
+                    if errors:
+                        break
+                    if objs or repeated:
+                        batches.put((list(objs.values()), repeated))
+                        processed += len(objs) + len(repeated)
+            finally:
+                # Always release the worker, even if parsing fails mid-file
+                batches.put(None)
+                worker.join()
+
+        if errors:
+            raise errors[0]
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"\nIDRN MASTER IMPORT COMPLETE!\n"
-                f"  Created: {created} items\n"
-                f"  Updated: {updated} items\n"
+                f"  Inserted/updated: {processed} items\n"
                 f"  Skipped: {skipped} rows\n"
             )
-        )
\ No newline at end of file
+        )
+
+    def arrow_rows(self, csv_path, raw_header):
+        """
+        Yield data rows as tuples of str, tokenized by pyarrow's C CSV reader
+        Streamed one record batch at a time, so the file is never held whole;
+        quoted cells may span lines, as the csv module allows
+        """
+        reader = pac.open_csv(
+            csv_path,
+            read_options=pac.ReadOptions(skip_rows=1, column_names=raw_header),
+            parse_options=pac.ParseOptions(newlines_in_values=True),
+            convert_options=pac.ConvertOptions(
+                column_types={name: pa.string() for name in raw_header}
+            ),
+        )
+        for batch in reader:
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+
+    def flush_worker(self, batches, use_copy, errors):
+        """Consume parsed chunks until the None sentinel; runs in its own thread"""
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if errors:
+                    # Keep draining so the producer never blocks on a full queue
+                    continue
+                try:
+                    self.flush_items(*batch, use_copy)
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            # The worker thread opened its own connection
+            connection.close()
+
+    def flush_items(self, objs, repeated, use_copy):
+        """
+        Write one chunk, committing it in its own transaction
+        Chunks are flushed in file order by a single worker, so upserting
+        repeated codes overwrites the rows an earlier chunk copied
+        """
+        with transaction.atomic():
+            if use_copy:
+                if objs:
+                    self.copy_items(objs)
+                objs = repeated
+            if objs:
+                # Single INSERT ... ON CONFLICT (item_code) DO UPDATE per batch
+                ItemInfo.objects.bulk_create(
+                    objs,
+                    batch_size=self.BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=['item_code'],
+                    update_fields=self.UPDATE_FIELDS,
+                )
+
+    def copy_items(self, objs):
+        """Load a batch of new ItemInfo rows with Postgres COPY"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # COPY bypasses auto_now, so stamp the batch explicitly
+        updated_at = timezone.now().isoformat()
+        for obj in objs:
+            writer.writerow((
+                obj.item_code, obj.item_name, obj.activity_name,
+                obj.resource_type, obj.category, obj.tags, 't', updated_at,
+            ))
+        buffer.seek(0)
+
+        columns = ', '.join(self.COPY_COLUMNS)
+        # FORCE_NOT_NULL keeps empty CSV fields as '' (matching bulk_create) instead of NULL
+        not_null = ', '.join(col for col in self.COPY_COLUMNS if col not in ('active', 'updated_at'))
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {ItemInfo._meta.db_table} ({columns}) "
+                f"FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({not_null}))",
+                buffer,
+            )
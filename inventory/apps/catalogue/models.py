@@ -1,7 +1,12 @@
 """
 Catalogue Models: Master item definitions
 """
+from functools import cached_property
+
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 
 class ItemInfo(models.Model):
@@ -10,28 +15,51 @@ class ItemInfo(models.Model):
     This defines the types of items that can be tracked in the system
     """
     item_code = models.CharField(max_length=50, unique=True)
-    item_name = models.CharField(max_length=255)
+    item_name = models.CharField(max_length=255, db_index=True)
     unit = models.CharField(max_length=50, blank=True, null=True)
-    perishability = models.CharField(max_length=50, blank=True, null=True)
-    category = models.CharField(max_length=100, blank=True, null=True)
-    resource_type = models.CharField(max_length=100, blank=True, null=True)
+    perishability = models.CharField(max_length=50, blank=True, null=True, db_index=True)
+    category = models.CharField(max_length=100, blank=True, null=True, db_index=True)
+    resource_type = models.CharField(max_length=100, blank=True, null=True, db_index=True)
     activity_name = models.CharField(max_length=255, blank=True, null=True)
     tags = models.TextField(blank=True, null=True, help_text="Comma-separated tags")
-    active = models.BooleanField(default=True)
+    active = models.BooleanField(default=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'item_info'
-        ordering = ['item_name']
+        indexes = [
+            # Trigram indexes so icontains searches (admin + API search_fields)
+            # avoid a full scan (needs pg_trgm)
+            GinIndex(fields=['tags'], opclasses=['gin_trgm_ops'], name='iteminfo_tags_trgm'),
+            GinIndex(fields=['item_name'], opclasses=['gin_trgm_ops'], name='iteminfo_name_trgm'),
+            GinIndex(fields=['item_code'], opclasses=['gin_trgm_ops'], name='iteminfo_code_trgm'),
+            GinIndex(fields=['category'], opclasses=['gin_trgm_ops'], name='iteminfo_category_trgm'),
+            GinIndex(fields=['activity_name'], opclasses=['gin_trgm_ops'], name='iteminfo_activity_trgm'),
+            # Common list filters combined with the default item_name ordering
+            models.Index(fields=['active', 'category', 'item_name'], name='iteminfo_active_cat_name'),
+            models.Index(fields=['active', 'resource_type'], name='iteminfo_active_restype'),
+            models.Index(fields=['item_name'], name='iteminfo_active_name', condition=Q(active=True)),
+            # Ready for case-insensitive ordering/lookups on item_name
+            models.Index(Lower('item_name'), name='iteminfo_lower_name_idx'),
+        ]
         verbose_name = 'Item Definition'
         verbose_name_plural = 'Item Definitions'
 
     def __str__(self):
         return f"{self.item_code} - {self.item_name}"
 
-    @property
+    def save(self, *args, **kwargs):
+        # Normalize tags on write
+        if self.tags:
+            self.tags = ','.join(tag.strip() for tag in self.tags.split(',') if tag.strip())
+        self.__dict__.pop('tag_list', None)
+        super().save(*args, **kwargs)
+
+    @cached_property
     def tag_list(self):
         """Return tags as a list"""
         if self.tags:
+            # Still stripped: bulk imports bypass save() and older rows were never normalized
             return [tag.strip() for tag in self.tags.split(',')]
         return []
 
@@ -57,9 +85,14 @@ class ItemAttribute(models.Model):
     datatype = models.CharField(max_length=20, choices=DATATYPE_CHOICES, default='string')
     class Meta:
         db_table = 'item_attributes'
-        ordering = ['item_info', 'key']
-        unique_together = ('item_info', 'key')
+        constraints = [
+            models.UniqueConstraint(fields=['item_info', 'key'], name='uniq_attr_per_item'),
+        ]
     
     def __str__(self):
         return f"{self.item_info.id} - {self.key}" 
 
+    @staticmethod
+    def cache_key(item_info_id, attr_id):
+        """Cache key for the serialized attribute served by attribute_detail GET"""
+        return f'catalogue:attr:{int(item_info_id)}:{int(attr_id)}'
@@ -2,12 +2,14 @@
 Catalogue Serializers
 """
 from rest_framework import serializers
+from backend.serializers import FastModelSerializer, UniqueViolationMixin
 from .models import ItemInfo, ItemAttribute
 
 
-class ItemInfoSerializer(serializers.ModelSerializer):
+class ItemInfoSerializer(UniqueViolationMixin, serializers.ModelSerializer):
     tag_list = serializers.ReadOnlyField()
     item_count = serializers.SerializerMethodField()
+    unique_violation_error = {'item_code': ['Item definition with this item code already exists.']}
 
     class Meta:
         model = ItemInfo
@@ -16,14 +18,34 @@ class ItemInfoSerializer(serializers.ModelSerializer):
             'category', 'resource_type', 'activity_name', 'tags',
             'tag_list', 'active', 'item_count'
         ]
+        # Uniqueness is enforced by the DB (see UniqueViolationMixin)
+        extra_kwargs = {'item_code': {'validators': []}}
         swagger_schema_name = 'ItemInfo'          # <-- exact component name
 
     def get_item_count(self, obj):
-        return obj.items.count()
+        # Annotated by ItemInfoViewSet.get_queryset; fall back for freshly created rows
+        item_count = getattr(obj, 'item_count', None)
+        if item_count is None:
+            return obj.items.count()
+        return item_count
 
 
-class ItemAttributeSerializer(serializers.ModelSerializer):
+class ItemInfoListSerializer(serializers.ModelSerializer):
+    """Lightweight list representation: no per-row item_count, tags only as tag_list"""
+    tag_list = serializers.ReadOnlyField()
+
+    class Meta:
+        model = ItemInfo
+        fields = [
+            'id', 'item_code', 'item_name', 'unit', 'perishability',
+            'category', 'resource_type', 'activity_name', 'tag_list', 'active'
+        ]
+        swagger_schema_name = 'ItemInfoList'      # <-- list payload
+
+
+class ItemAttributeSerializer(UniqueViolationMixin, FastModelSerializer):
     item_name = serializers.CharField(source='item_info.item_name', read_only=True)
+    unique_violation_error = {'key': ['This item already has an attribute with this key.']}
 
     class Meta:
         model = ItemAttribute
@@ -33,6 +55,15 @@ class ItemAttributeSerializer(serializers.ModelSerializer):
         swagger_schema_name = 'ItemAttribute'     # <-- exact component name
 
 
+class ItemAttributeBulkSerializer(serializers.ModelSerializer):
+    """Single entry of a bulk attribute payload; item_info comes from the URL"""
+
+    class Meta:
+        model = ItemAttribute
+        fields = ['key', 'datatype']
+        swagger_schema_name = 'ItemAttributeBulk'
+
+
 class ItemInfoDetailSerializer(ItemInfoSerializer):
     attributes = ItemAttributeSerializer(many=True, read_only=True)
 
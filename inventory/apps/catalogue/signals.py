@@ -0,0 +1,13 @@
+"""
+Catalogue Signals - drop cached attribute payloads when an attribute changes
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ItemAttribute
+
+
+@receiver(post_save, sender=ItemAttribute)
+@receiver(post_delete, sender=ItemAttribute)
+def invalidate_attribute_cache(sender, instance, **kwargs):
+    cache.delete(ItemAttribute.cache_key(instance.item_info_id, instance.pk))
@@ -1,10 +1,20 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from apps.departments.models import Department
 from apps.locations.models import District, Mandal, Village
 from apps.catalogue.models import ItemInfo, ItemAttribute
+from apps.catalogue.management.commands.import_idrn_master import Command as ImportIdrnMaster
 from apps.rbac.models import Role, Permission, RolePermission
 from apps.users.models import UserRole
 
@@ -12,41 +22,46 @@ User = get_user_model()
 
 
 class CatalogueAPITestCase(TestCase):
-    def setUp(self):
-        self.client = APIClient()
-
+    @classmethod
+    def setUpTestData(cls):
+        # Created once per class; Django isolates these attributes per test
         # Location & Department
-        self.district = District.objects.create(district_name="TD", district_code_ap="TD01")
-        self.mandal = Mandal.objects.create(mandal_name="TM", mandal_code_ap="TM01", district=self.district)
-        self.village = Village.objects.create(village_name="TV", village_code_ap="TV01", district=self.district, mandal=self.mandal)
-        self.department = Department.objects.create(org_name="TD", org_shortname="TD", org_code="TD001", org_type="Government")
+        cls.district = District.objects.create(district_name="TD", district_code_ap="TD01")
+        cls.mandal = Mandal.objects.create(mandal_name="TM", mandal_code_ap="TM01", district=cls.district)
+        cls.village = Village.objects.create(village_name="TV", village_code_ap="TV01", district=cls.district, mandal=cls.mandal)
+        cls.department = Department.objects.create(org_name="TD", org_shortname="TD", org_code="TD001", org_type="Government")
 
         # User
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             email="user@test.com", password="user123", name="Test User",
-            phone_no="+91-9876543210", dept=self.department, location=self.village
+            phone_no="+91-9876543210", dept=cls.department, location=cls.village
         )
 
         # Permissions & Role
         perms = ["view_catalogue", "create_catalogue", "update_catalogue", "delete_catalogue"]
         permissions = {name: Permission.objects.create(name=name) for name in perms}
-        self.role = Role.objects.create(name="Catalogue Manager")
-        for perm in permissions.values():
-            RolePermission.objects.create(role=self.role, permission=perm)
-        UserRole.objects.create(user=self.user, role=self.role)
+        cls.role = Role.objects.create(name="Catalogue Manager")
+        RolePermission.objects.bulk_create([
+            RolePermission(role=cls.role, permission=perm) for perm in permissions.values()
+        ])
+        UserRole.objects.create(user=cls.user, role=cls.role)
 
         # ItemInfo
-        self.item_info = ItemInfo.objects.create(
+        cls.item_info = ItemInfo.objects.create(
             item_code="TI001", item_name="Test Item", category="Electronics",
             resource_type="Hardware", perishability="Non-Perishable", unit="Piece",
             tags="test,item", activity_name="Testing"
         )
 
         # ItemAttribute
-        self.item_attribute = ItemAttribute.objects.create(
-            item_info=self.item_info, key="ram", datatype="string"
+        cls.item_attribute = ItemAttribute.objects.create(
+            item_info=cls.item_info, key="ram", datatype="string"
         )
 
+    def setUp(self):
+        # The LocMem cache outlives each test's transaction rollback
+        cache.clear()
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     # -------------------------------------------------
@@ -57,9 +72,18 @@ class CatalogueAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data['results']), 1)
 
+    def test_list_item_info_not_modified(self):
+        response = self.client.get('/api/catalogue/')
+        etag = response['ETag']
+        response = self.client.get('/api/catalogue/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        ItemInfo.objects.create(item_code="E001", item_name="Changed")
+        response = self.client.get('/api/catalogue/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_retrieve_item_info_with_attributes(self):
         response = self.client.get(f'/api/catalogue/{self.item_info.id}/')
-        print(response.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['item_name'], "Test Item")
         self.assertIn('attributes', response.data)
@@ -73,7 +97,22 @@ class CatalogueAPITestCase(TestCase):
         }
         response = self.client.post('/api/catalogue/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(ItemInfo.objects.count(), 2)
+        self.assertTrue(ItemInfo.objects.filter(item_code="NI001").exists())
+
+    def test_duplicate_item_code_fails(self):
+        data = {"item_code": self.item_info.item_code, "item_name": "Duplicate"}
+        response = self.client.post('/api/catalogue/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('item_code', response.data)
+
+    def test_other_integrity_error_not_reported_as_duplicate(self):
+        data = {"item_code": "NI002", "item_name": "New Item"}
+        with mock.patch(
+            'rest_framework.serializers.ModelSerializer.create',
+            side_effect=IntegrityError('null value in column "item_name"'),
+        ):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/catalogue/', data, format='json')
 
     def test_update_item_info(self):
         response = self.client.patch(
@@ -133,12 +172,35 @@ class CatalogueAPITestCase(TestCase):
         self.item_attribute.refresh_from_db()
         self.assertEqual(self.item_attribute.key, "memory")
 
+    def test_retrieve_attribute_via_action_after_update(self):
+        url = f'/api/catalogue/{self.item_info.id}/attributes/{self.item_attribute.id}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['key'], "ram")
+
+        self.client.patch(url, {"key": "memory"})
+        response = self.client.get(url)
+        self.assertEqual(response.data['key'], "memory")
+
+    def test_retrieve_missing_attribute_not_cached(self):
+        missing_id = ItemAttribute.objects.order_by('-id').values_list('id', flat=True).first() + 1000
+        response = self.client.get(f'/api/catalogue/{self.item_info.id}/attributes/{missing_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn(ItemAttribute.cache_key(self.item_info.id, missing_id), cache)
+
     def test_delete_attribute_via_action(self):
         url = f'/api/catalogue/{self.item_info.id}/attributes/{self.item_attribute.id}/'
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(ItemAttribute.objects.filter(id=self.item_attribute.id).exists())
 
+    def test_delete_attribute_of_other_item_not_found(self):
+        other = ItemInfo.objects.create(item_code="OT001", item_name="Other Item")
+        url = f'/api/catalogue/{other.id}/attributes/{self.item_attribute.id}/'
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(ItemAttribute.objects.filter(id=self.item_attribute.id).exists())
+
     def test_duplicate_attribute_key_fails(self):
         data = {"item_info": self.item_info.id, "key": "ram", "datatype": "string"}
         response = self.client.post(
@@ -146,10 +208,119 @@ class CatalogueAPITestCase(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_create_attributes_skips_existing_keys(self):
+        payload = [
+            {"key": "ram", "datatype": "string"},
+            {"key": "cpu", "datatype": "string"},
+            {"key": "weight", "datatype": "number"},
+        ]
+        url = f'/api/catalogue/{self.item_info.id}/attributes/bulk/'
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], ["cpu", "weight"])
+        self.assertEqual(response.data['skipped'], ["ram"])
+        self.assertEqual(self.item_info.attributes.count(), 3)
+
     # -------------------------------------------------
     # Permissions
     # -------------------------------------------------
+    def test_missing_permission_forbidden(self):
+        other = User.objects.create_user(
+            email="norole@test.com", password="user123", name="No Role",
+            dept=self.department, location=self.village
+        )
+        client = APIClient()
+        client.force_authenticate(user=other)
+        response = client.get('/api/catalogue/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_retrieve_attribute_without_permission_forbidden(self):
+        other = User.objects.create_user(
+            email="norole@test.com", password="user123", name="No Role",
+            dept=self.department, location=self.village
+        )
+        client = APIClient()
+        client.force_authenticate(user=other)
+        response = client.get(f'/api/catalogue/attributes/{self.item_attribute.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_partial_update_attribute_without_permission_forbidden(self):
+        viewer = User.objects.create_user(
+            email="viewer@test.com", password="user123", name="Viewer",
+            dept=self.department, location=self.village
+        )
+        role = Role.objects.create(name="Catalogue Viewer")
+        RolePermission.objects.create(role=role, permission=Permission.objects.get(name="view_catalogue"))
+        UserRole.objects.create(user=viewer, role=role)
+        client = APIClient()
+        client.force_authenticate(user=viewer)
+        response = client.patch(
+            f'/api/catalogue/attributes/{self.item_attribute.id}/',
+            {"key": "memory"}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.item_attribute.refresh_from_db()
+        self.assertEqual(self.item_attribute.key, "ram")
+
     def test_unauthenticated_access_denied(self):
-        self.client.logout()
-        response = self.client.get('/api/catalogue/')
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        response = APIClient().get('/api/catalogue/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ImportIdrnMasterTestCase(TransactionTestCase):
+    # The importer flushes from a worker thread on its own connection, so rows must really commit
+
+    HEADER = "S.No,Item Code,Item Name,Activity Name,Resource Type,Category Name\n"
+
+    def setUp(self):
+        self.csv_path = self.write_csv(
+            "1,A1,First,Rescue,Equipment,Cutters\n"
+            "2,B1,Other,Rescue,Equipment,Cutters\n"
+            "3,A1,Last,Rescue,Equipment,Cutters\n"
+        )
+
+    def write_csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', newline='') as f:
+            f.write(self.HEADER + rows)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, **options):
+        # Two rows per chunk puts the repeated code in a later chunk
+        with mock.patch.object(ImportIdrnMaster, 'CHUNK_SIZE', 2):
+            call_command('import_idrn_master', file=self.csv_path, stdout=StringIO(), **options)
+
+    def test_repeated_code_last_row_wins(self):
+        self.run_import()
+        self.assertEqual(ItemInfo.objects.get(item_code='A1').item_name, "Last")
+
+    def test_repeated_code_last_row_wins_with_clear(self):
+        self.run_import(clear=True)
+        self.assertEqual(ItemInfo.objects.get(item_code='A1').item_name, "Last")
+        self.assertEqual(ItemInfo.objects.count(), 2)
+
+    def test_arrow_rows_match_csv_reader(self):
+        path = self.write_csv(
+            '1,A1,"Two\nLines",Rescue,Equipment,Cutters\n'
+            '\n'
+            '2,B1,"Quoted, comma",Rescue,,Cutters\n'
+        )
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            expected = [tuple(row) for row in reader if row]
+        self.assertEqual(list(ImportIdrnMaster().arrow_rows(path, header)), expected)
+
+    def test_import_without_pyarrow_matches(self):
+        self.csv_path = self.write_csv(
+            '1,A1,"Two\nLines",Rescue,Equipment,Cutters\n'
+            '2,B1,Other,Rescue,Equipment,Cutters\n'
+        )
+        fields = ('item_code', 'item_name', 'activity_name', 'resource_type', 'category', 'tags')
+        self.run_import(clear=True)
+        with_arrow = list(ItemInfo.objects.order_by('item_code').values_list(*fields))
+        with mock.patch('apps.catalogue.management.commands.import_idrn_master.pac', None):
+            self.run_import(clear=True)
+        self.assertEqual(list(ItemInfo.objects.order_by('item_code').values_list(*fields)), with_arrow)
+        self.assertEqual(with_arrow[0][1], "Two\nLines")
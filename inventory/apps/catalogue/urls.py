@@ -6,6 +6,8 @@ from rest_framework.routers import DefaultRouter
 from .views import ItemInfoViewSet, ItemAttributeViewSet
 
 router = DefaultRouter()
+# Registered before the empty prefix so 'attributes/' is not taken as an ItemInfo pk
+router.register(r'attributes', ItemAttributeViewSet, basename='itemattribute')
 router.register(r'', ItemInfoViewSet, basename='iteminfo')
 
 urlpatterns = [
@@ -5,6 +5,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import CursorPagination
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 import django_filters
@@ -15,10 +21,15 @@ from drf_yasg import openapi
 from .models import ItemInfo, ItemAttribute
 from .serializers import (
     ItemInfoSerializer,
+    ItemInfoListSerializer,
     ItemAttributeSerializer,
+    ItemAttributeBulkSerializer,
     ItemInfoDetailSerializer,
 )
-from apps.rbac.permissions import has_permission
+from apps.rbac.permissions import HasActionPermission
+from backend.mixins import ConditionalListMixin
+from backend.pagination import CappedPageNumberPagination
+from backend.renderers import ORJSONRenderer
 
 
 # ----------------------------------------------------------------------
@@ -35,21 +46,63 @@ class ItemAttributeFilter(django_filters.FilterSet):
         fields = ['datatype', 'item_info_id', 'item_info_category']
 
 
+class ItemInfoFilter(django_filters.FilterSet):
+    # Declared once at import; filterset_fields would rebuild a FilterSet class per request
+    class Meta:
+        model = ItemInfo
+        fields = ['active', 'category', 'resource_type', 'perishability', 'item_code']
+
+
+# ----------------------------------------------------------------------
+# PAGINATION
+# ----------------------------------------------------------------------
+class CatalogueCursorPagination(CursorPagination):
+    """Keyset pagination: no COUNT(*) and no OFFSET scans on deep pages"""
+    ordering = ('item_name', 'id')
+    page_size = 50
+
+
+# ----------------------------------------------------------------------
+# Shared base
+# ----------------------------------------------------------------------
+class CatalogueModelViewSet(viewsets.ModelViewSet):
+    """
+    Common configuration for catalogue viewsets; subclasses only declare
+    action_permissions (checked once per request by HasActionPermission)
+    """
+    permission_classes = [IsAuthenticated, HasActionPermission]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = CappedPageNumberPagination
+    action_permissions = {}
+
+
 # ----------------------------------------------------------------------
 # ItemAttribute – dedicated ViewSet
 # ----------------------------------------------------------------------
-class ItemAttributeViewSet(viewsets.ModelViewSet):
+class ItemAttributeViewSet(CatalogueModelViewSet):
     serializer_class = ItemAttributeSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    action_permissions = {
+        'list': 'view_catalogue',
+        'retrieve': 'view_catalogue',
+        'create': 'create_catalogue',
+        'update': 'update_catalogue',
+        # PATCH went through the decorated update() before the action map
+        'partial_update': 'update_catalogue',
+        'destroy': 'delete_catalogue',
+    }
     filterset_class = ItemAttributeFilter
-    queryset = ItemAttribute.objects.select_related('item_info').all()
+    # Join item_info for the serialized item_name, fetching only the columns rendered
+    queryset = ItemAttribute.objects.select_related('item_info').only(
+        'id', 'item_info', 'key', 'datatype', 'item_info__item_name'
+    )
+    ordering_fields = ['id', 'key', 'datatype']
+    ordering = ['item_info', 'key']
 
     @swagger_auto_schema(
         operation_summary='List all attribute definitions',
         tags=['Catalogue – Attribute Definitions'],
     )
-    @has_permission("view_catalogue")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -59,7 +112,6 @@ class ItemAttributeViewSet(viewsets.ModelViewSet):
         responses={201: ItemAttributeSerializer},
         tags=['Catalogue – Attribute Definitions'],
     )
-    @has_permission("create_catalogue")
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
@@ -69,7 +121,6 @@ class ItemAttributeViewSet(viewsets.ModelViewSet):
         responses={200: ItemAttributeSerializer},
         tags=['Catalogue – Attribute Definitions'],
     )
-    @has_permission("update_catalogue")
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
@@ -77,7 +128,6 @@ class ItemAttributeViewSet(viewsets.ModelViewSet):
         operation_summary='Delete an attribute definition',
         tags=['Catalogue – Attribute Definitions'],
     )
-    @has_permission("delete_catalogue")
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
@@ -85,24 +135,64 @@ class ItemAttributeViewSet(viewsets.ModelViewSet):
 # ----------------------------------------------------------------------
 # ItemInfo – main catalogue ViewSet
 # ----------------------------------------------------------------------
-class ItemInfoViewSet(viewsets.ModelViewSet):
-    queryset = ItemInfo.objects.prefetch_related('attributes').all()
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['active', 'category', 'resource_type', 'perishability', 'item_code']
+class ItemInfoViewSet(ConditionalListMixin, CatalogueModelViewSet):
+    queryset = ItemInfo.objects.all()
+    action_permissions = {
+        'list': 'view_catalogue',
+        'retrieve': 'view_catalogue',
+        'create': 'create_catalogue',
+        'update': 'update_catalogue',
+        'partial_update': 'update_catalogue',
+        'destroy': 'delete_catalogue',
+        'attributes': 'update_catalogue',
+        'bulk_attributes': 'update_catalogue',
+        'attribute_detail': 'update_catalogue',
+    }
+    pagination_class = CatalogueCursorPagination
+    ATTRIBUTE_CACHE_TIMEOUT = 60
+    filterset_class = ItemInfoFilter
     search_fields = ['item_name', 'item_code', 'category', 'tags', 'activity_name']
+    # Indexed columns only, so the cursor always walks an index
     ordering_fields = ['id', 'item_name', 'item_code']
-    ordering = ['item_name']
+    ordering = ['item_name', 'id']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Select just what ItemInfoListSerializer renders (tag_list is derived from tags)
+            return queryset.only(
+                'id', 'item_code', 'item_name', 'unit', 'perishability',
+                'category', 'resource_type', 'activity_name', 'tags', 'active'
+            )
+        if self.action == 'retrieve':
+            # Only the detail serializer renders attributes; fetch just the serialized columns
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'attributes',
+                    queryset=ItemAttribute.objects.only(
+                        'id', 'item_info', 'key', 'datatype'
+                    ).order_by('key'),
+                )
+            )
+        # Count items in the same query instead of one COUNT(*) per row
+        return queryset.annotate(item_count=Count('items'))
+
+    def get_list_stats(self):
+        # Cheap validator: any insert, update or delete changes MAX(updated_at) or COUNT
+        return ItemInfo.objects.aggregate(last_modified=Max('updated_at'), total=Count('id'))
 
     def get_serializer_class(self):
-        return ItemInfoDetailSerializer if self.action == 'retrieve' else ItemInfoSerializer
+        if self.action == 'list':
+            return ItemInfoListSerializer
+        if self.action == 'retrieve':
+            return ItemInfoDetailSerializer
+        return ItemInfoSerializer
 
     # ----- standard actions ------------------------------------------------
     @swagger_auto_schema(
         operation_summary='List catalogue entries',
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("view_catalogue")
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -112,7 +202,6 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         responses={201: ItemInfoSerializer},
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("create_catalogue")
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
 
@@ -121,7 +210,6 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         responses={200: ItemInfoDetailSerializer},
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("view_catalogue")
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -131,7 +219,6 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         responses={200: ItemInfoSerializer},
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("update_catalogue")
     def update(self, request, *args, **kwargs):
         return super().update(request, *args, **kwargs)
 
@@ -141,7 +228,6 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         responses={200: ItemInfoSerializer},
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("update_catalogue")
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
 
@@ -149,7 +235,6 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         operation_summary='Delete a catalogue entry',
         tags=['Catalogue – ItemInfo'],
     )
-    @has_permission("delete_catalogue")
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
@@ -168,43 +253,76 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
         tags=['Catalogue – ItemInfo Attributes'],
     )
     @action(detail=True, methods=['get', 'post'], url_path='attributes')
-    @has_permission("update_catalogue")
     def attributes(self, request, pk=None):
-        item_info = self.get_object()
-
         if request.method == 'GET':
-            attrs = item_info.attributes.all()
+            # Query the attributes directly; the parent is only checked for 404s
+            attrs = list(
+                ItemAttribute.objects.filter(item_info_id=pk)
+                .select_related('item_info')
+                .only('id', 'item_info', 'key', 'datatype', 'item_info__item_name')
+                .order_by('key')
+            )
+            if not attrs and not ItemInfo.objects.filter(pk=pk).exists():
+                raise Http404
             ser = ItemAttributeSerializer(attrs, many=True)
             return Response(ser.data)
 
-        # POST
+        # POST – only the parent's id and the serialized item_name are needed
+        item_info = get_object_or_404(ItemInfo.objects.only('id', 'item_name'), pk=pk)
         ser = ItemAttributeSerializer(data=request.data)
         if ser.is_valid():
             ser.save(item_info=item_info)
             return Response(ser.data, status=status.HTTP_201_CREATED)
         return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-    
-        item_info = self.get_object()
 
-        try:
-            attr = ItemAttribute.objects.get(id=attr_id, item_info=item_info)
-        except ItemAttribute.DoesNotExist:
-            return Response(
-                {'error': 'Attribute not found'}, status=status.HTTP_404_NOT_FOUND
-            )
+    @swagger_auto_schema(
+        method='post',
+        operation_summary='Create several attribute definitions at once',
+        request_body=ItemAttributeBulkSerializer(many=True),
+        responses={201: openapi.Response('Created and skipped keys')},
+        tags=['Catalogue – ItemInfo Attributes'],
+    )
+    @action(detail=True, methods=['post'], url_path='attributes/bulk')
+    def bulk_attributes(self, request, pk=None):
+        item_info = get_object_or_404(ItemInfo.objects.only('id'), pk=pk)
 
-        if request.method == 'PATCH':
-            ser = ItemAttributeSerializer(attr, data=request.data, partial=True)
-            if ser.is_valid():
-                ser.save()
-                return Response(ser.data)
+        ser = ItemAttributeBulkSerializer(data=request.data, many=True)
+        if not ser.is_valid():
             return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # DELETE
-        attr.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        # One query for the keys already defined, then a single batched INSERT
+        seen = set(item_info.attributes.values_list('key', flat=True))
+        to_create = []
+        skipped = []
+        for data in ser.validated_data:
+            if data['key'] in seen:
+                skipped.append(data['key'])
+                continue
+            seen.add(data['key'])
+            to_create.append(ItemAttribute(item_info=item_info, **data))
+
+        ItemAttribute.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+        return Response(
+            {
+                'created': [attr.key for attr in to_create],
+                'skipped': skipped,
+            },
+            status=status.HTTP_201_CREATED
+        )
 
+    @swagger_auto_schema(
+        method='get',
+        operation_summary='Retrieve an attribute definition',
+        responses={200: ItemAttributeSerializer},
+        manual_parameters=[
+            openapi.Parameter(
+                'attr_id', openapi.IN_PATH,
+                description='ID of the ItemAttribute',
+                type=openapi.TYPE_INTEGER
+            )
+        ],
+        tags=['Catalogue – ItemInfo Attributes'],
+    )
     @swagger_auto_schema(
         method='patch',
         operation_summary='Update an attribute definition',
@@ -234,27 +352,54 @@ class ItemInfoViewSet(viewsets.ModelViewSet):
     )
     @action(
         detail=True,
-        methods=['patch', 'delete'],
+        methods=['get', 'patch', 'delete'],
         url_path=r'attributes/(?P<attr_id>\d+)'
     )
-    @has_permission("update_catalogue")
     def attribute_detail(self, request, pk=None, attr_id=None):
-        item_info = self.get_object()
+        if request.method == 'GET':
+            # Served from the cache; apps.catalogue.signals drops the entry on save/delete.
+            # A renamed parent's item_name can lag by at most the timeout. Misses are
+            # not cached: bulk_attributes creates rows without signals to clear them
+            cache_key = ItemAttribute.cache_key(pk, attr_id)
+            data = cache.get(cache_key)
+            if data is None:
+                data = self.serialized_attribute(pk, attr_id)
+                if data is None:
+                    return Response(
+                        {'error': 'Attribute not found'}, status=status.HTTP_404_NOT_FOUND
+                    )
+                cache.set(cache_key, data, self.ATTRIBUTE_CACHE_TIMEOUT)
+            return Response(data)
+
+        if request.method == 'DELETE':
+            # Delete straight from a filtered queryset; no instance to load first
+            deleted, _ = ItemAttribute.objects.filter(id=attr_id, item_info_id=pk).delete()
+            if not deleted:
+                return Response(
+                    {'error': 'Attribute not found'}, status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(status=status.HTTP_204_NO_CONTENT)
 
+        # PATCH – filter by the parent's id directly instead of loading it via get_object()
         try:
-            attr = ItemAttribute.objects.get(id=attr_id, item_info=item_info)
+            attr = ItemAttribute.objects.select_related('item_info').only(
+                'id', 'item_info', 'key', 'datatype', 'item_info__item_name'
+            ).get(id=attr_id, item_info_id=pk)
         except ItemAttribute.DoesNotExist:
             return Response(
                 {'error': 'Attribute not found'}, status=status.HTTP_404_NOT_FOUND
             )
 
-        if request.method == 'PATCH':
-            ser = ItemAttributeSerializer(attr, data=request.data, partial=True)
-            if ser.is_valid():
-                ser.save()
-                return Response(ser.data)
-            return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
+        ser = ItemAttributeSerializer(attr, data=request.data, partial=True)
+        if ser.is_valid():
+            ser.save()
+            return Response(ser.data)
+        return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # DELETE
-        attr.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    def serialized_attribute(self, pk, attr_id):
+        attr = ItemAttribute.objects.select_related('item_info').only(
+            'id', 'item_info', 'key', 'datatype', 'item_info__item_name'
+        ).filter(id=attr_id, item_info_id=pk).first()
+        if attr is None:
+            return None
+        return dict(ItemAttributeSerializer(attr).data)
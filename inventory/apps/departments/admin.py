@@ -7,7 +7,12 @@ from .models import Department, DepartmentContact
 
 class DepartmentContactInline(admin.TabularInline):
     model = DepartmentContact
-    extra = 1
+    extra = 0
+    show_change_link = True
+
+    def get_queryset(self, request):
+        # Each inline row renders str(contact), which reads contact.dept
+        return super().get_queryset(request).select_related('dept')
 
 
 @admin.register(Department)
@@ -22,5 +27,6 @@ class DepartmentAdmin(admin.ModelAdmin):
 @admin.register(DepartmentContact)
 class DepartmentContactAdmin(admin.ModelAdmin):
     list_display = ['id', 'dept', 'contact_type', 'contact_value']
+    list_select_related = ['dept']
     list_filter = ['contact_type']
     search_fields = ['dept__org_name', 'contact_value']
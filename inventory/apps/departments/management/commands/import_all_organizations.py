@@ -1,14 +1,21 @@
 import csv
 import os
+from itertools import islice
 from pathlib import Path
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
 from apps.departments.models import Department  # UPDATE THIS
+from backend.csv_import import header_positions
 
 
 class Command(BaseCommand):
     help = "Import ALL organization types (SD, HOD, SU, AO) from CSV files"
 
+    # Rows per INSERT ... ON CONFLICT statement; keeps well under Postgres's parameter limit
+    BATCH_SIZE = 1000
+    UPDATE_FIELDS = ["org_shortname", "org_type", "org_name", "report_org", "updated_at"]
+    EXPECTED_COLUMNS = frozenset({"ID", "ORG_CODE", "ORG_SHORTNAME", "ORG_TYPE", "ORG_NAME", "REPORT_ORG"})
+
     # List all CSV files with their expected ORG_TYPE
     CSV_FILES = [
         {
@@ -51,6 +58,11 @@ class Command(BaseCommand):
             type=str,
             help='Folder containing the CSV files (default: same as this command)',
         )
+        parser.add_argument(
+            '--no-update',
+            action='store_true',
+            help='Only insert new org codes; leave existing departments untouched (ON CONFLICT DO NOTHING)',
+        )
 
     def handle(self, *args, **options):
         folder = options['folder']
@@ -58,6 +70,7 @@ class Command(BaseCommand):
             folder = Path(__file__).parent
         else:
             folder = Path(folder)
+        self.update_existing = not options['no_update']
 
         total_created = 0
         total_skipped = 0
@@ -88,63 +101,58 @@ class Command(BaseCommand):
 
     def import_csv(self, csv_path, expected_org_type):
         self.stdout.write(f"Importing {csv_path.name} (expected type: {expected_org_type})...")
-        created = 0
-        skipped = 0
-        objs = []
+        counts = {"skipped": 0}
 
         with open(csv_path, newline='', encoding='utf-8-sig') as f:  # ← 'utf-8-sig' removes BOM
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            raw_header = next(reader, [])
 
             # Debug: Print actual field names
-            self.stdout.write(f"CSV Headers: {list(reader.fieldnames)}")
-
-            # Normalize headers: strip whitespace and BOM
-            normalized_fieldnames = [field.strip() for field in reader.fieldnames]
-            reader.fieldnames = normalized_fieldnames
+            self.stdout.write(f"CSV Headers: {raw_header}")
 
-            expected_cols = {"ID", "ORG_CODE", "ORG_SHORTNAME", "ORG_TYPE", "ORG_NAME", "REPORT_ORG"}
-            if not expected_cols.issubset(set(normalized_fieldnames)):
-                missing = expected_cols - set(normalized_fieldnames)
-                self.stdout.write(self.style.ERROR(f"Missing columns: {missing}"))
+            try:
+                idx = header_positions(raw_header, self.EXPECTED_COLUMNS)
+            except ValueError as e:
+                self.stdout.write(self.style.ERROR(str(e)))
                 return 0, 0
 
-            for row in reader:
-                # Use normalized keys
-                org_code = row.get("ORG_CODE", "").strip()
-                if not org_code:
-                    skipped += 1
-                    continue
-
-                org_type = row.get("ORG_TYPE", "").strip()
-                if org_type != expected_org_type:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Type mismatch: {org_code} is {org_type}, expected {expected_org_type}"
-                        )
-                    )
+            # Rows are built lazily and upserted BATCH_SIZE at a time while the file is read
+            created = self.upsert_departments(
+                self.iter_departments(reader, idx, expected_org_type, counts)
+            )
 
-                objs.append(
-                    Department(
-                        org_code=org_code,
-                        org_shortname=row.get("ORG_SHORTNAME", "").strip(),
-                        org_type=org_type,
-                        org_name=row.get("ORG_NAME", "").strip(),
-                        report_org=row.get("REPORT_ORG", "").strip() or None,
-                    )
-                )
+        skipped = counts["skipped"]
+        self.stdout.write(f"  → {created} inserted/updated, {skipped} skipped")
+        return created, skipped
 
-        if objs:
-            with transaction.atomic():
-                results = Department.objects.bulk_create(
-                    objs,
-                    update_conflicts=True,
-                    update_fields=["org_shortname", "org_type", "org_name", "report_org"],
-                    unique_fields=["org_code"],
+    def iter_departments(self, reader, idx, expected_org_type, counts):
+        code, short, typ, name, report = (
+            idx["ORG_CODE"], idx["ORG_SHORTNAME"], idx["ORG_TYPE"],
+            idx["ORG_NAME"], idx["REPORT_ORG"],
+        )
+        for row in reader:
+            if not row:
+                continue
+            org_code = row[code].strip()
+            if not org_code:
+                counts["skipped"] += 1
+                continue
+
+            org_type = row[typ].strip()
+            if org_type != expected_org_type:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Type mismatch: {org_code} is {org_type}, expected {expected_org_type}"
+                    )
                 )
-                created = len(results)
 
-        self.stdout.write(f"  → {created} inserted/updated, {skipped} skipped")
-        return created, skipped
+            yield Department(
+                org_code=org_code,
+                org_shortname=row[short].strip(),
+                org_type=org_type,
+                org_name=row[name].strip(),
+                report_org=row[report].strip() or None,
+            )
 
     def import_ao_data(self):
         self.stdout.write("Importing AO (Autonomous Organizations)...")
@@ -167,14 +175,36 @@ class Command(BaseCommand):
 
         created = 0
         if objs:
-            with transaction.atomic():
-                results = Department.objects.bulk_create(
-                    objs,
-                    update_conflicts=True,
-                    update_fields=["org_shortname", "org_type", "org_name", "report_org"],
-                    unique_fields=["org_code"],
-                )
-                created = len(results)
+            created = self.upsert_departments(objs)
 
         self.stdout.write(f"  → {created} AO entries inserted/updated")
-        return created, skipped
\ No newline at end of file
+        return created, skipped
+
+    def upsert_departments(self, objs):
+        """Write departments in batches; returns the number of rows inserted or updated"""
+        objs = iter(objs)
+        written = 0
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # The import is idempotent; don't wait on WAL flushes for it
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL synchronous_commit = off")
+            while chunk := list(islice(objs, self.BATCH_SIZE)):
+                if self.update_existing:
+                    # Every row is either inserted or updated
+                    written += len(Department.objects.bulk_create(
+                        chunk,
+                        update_conflicts=True,
+                        update_fields=self.UPDATE_FIELDS,
+                        unique_fields=["org_code"],
+                    ))
+                else:
+                    # bulk_create returns ignored rows too, so count only codes not already present
+                    codes = {obj.org_code for obj in chunk}
+                    existing = set(
+                        Department.objects.filter(org_code__in=codes).values_list('org_code', flat=True)
+                    )
+                    # DO NOTHING skips the row update and index maintenance on conflict
+                    Department.objects.bulk_create(chunk, ignore_conflicts=True)
+                    written += len(codes - existing)
+        return written
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.departments.models import Department, DepartmentContact
+
+
+class Command(BaseCommand):
+    help = "Recompute Department.contact_count from department_contacts (run once after adding the column)"
+
+    def handle(self, *args, **options):
+        counts = (
+            DepartmentContact.objects.filter(dept=OuterRef('pk'))
+            .order_by()
+            .values('dept')
+            .annotate(n=Count('id'))
+            .values('n')
+        )
+        updated = Department.objects.update(contact_count=Coalesce(Subquery(counts), 0))
+        self.stdout.write(self.style.SUCCESS(f"Recounted contacts for {updated} departments"))
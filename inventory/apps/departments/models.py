@@ -1,6 +1,7 @@
 """
 Department Models
 """
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 
@@ -19,10 +20,25 @@ class Department(models.Model):
     contact_person_address = models.TextField(blank=True, null=True)
     pin_code = models.CharField(max_length=10, blank=True, null=True)
     active = models.BooleanField(default=True)
+    # Maintained by apps.departments.signals; saves a COUNT per listed department
+    contact_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = 'departments'
         ordering = ['org_name']
+        indexes = [
+            # List/admin filters (org_code is already indexed by its unique constraint)
+            models.Index(fields=['org_type'], name='departments_org_type_idx'),
+            models.Index(fields=['active'], name='departments_active_idx'),
+            # Default ordering, so paginated lists read in index order
+            models.Index(fields=['org_name'], name='departments_org_name_idx'),
+            # Trigram indexes for the API search_fields' icontains (needs pg_trgm)
+            GinIndex(fields=['org_name'], opclasses=['gin_trgm_ops'], name='dept_org_name_trgm'),
+            GinIndex(fields=['org_shortname'], opclasses=['gin_trgm_ops'], name='dept_org_shortname_trgm'),
+            GinIndex(fields=['org_code'], opclasses=['gin_trgm_ops'], name='dept_org_code_trgm'),
+            GinIndex(fields=['contact_person_name'], opclasses=['gin_trgm_ops'], name='dept_contact_person_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.org_shortname} - {self.org_name}"
@@ -51,6 +67,19 @@ class DepartmentContact(models.Model):
     class Meta:
         db_table = 'department_contacts'
         ordering = ['dept', 'contact_type']
+        indexes = [
+            # Matches the default ordering, so per-department contact lists read in index order
+            models.Index(fields=['dept', 'contact_type'], name='deptcontact_dept_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.dept.org_shortname} - {self.contact_type}: {self.contact_value}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so moving a contact to another department moves its count too;
+        # left unset when dept_id was deferred, since the loaded value is unknown
+        if 'dept_id' in instance.__dict__:
+            instance._loaded_dept_id = instance.__dict__['dept_id']
+        return instance
@@ -2,19 +2,19 @@
 Department Serializers
 """
 from rest_framework import serializers
+from backend.serializers import FastModelSerializer
 from .models import Department, DepartmentContact
 
 
-class DepartmentContactSerializer(serializers.ModelSerializer):
+class DepartmentContactSerializer(FastModelSerializer):
     class Meta:
         model = DepartmentContact
         fields = ['id', 'contact_type', 'contact_value']
         swagger_schema_name = 'DepartmentContact'   # exact component name
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(FastModelSerializer):
     contacts = DepartmentContactSerializer(many=True, read_only=True)
-    contact_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Department
@@ -26,8 +26,19 @@ class DepartmentSerializer(serializers.ModelSerializer):
         ]
         swagger_schema_name = 'Department'          # exact component name
 
-    def get_contact_count(self, obj):
-        return obj.contacts.count()
+
+class DepartmentListSerializer(FastModelSerializer):
+    """Lightweight list representation: contact_count only, no nested contacts"""
+
+    class Meta:
+        model = Department
+        fields = [
+            'id', 'org_code', 'org_shortname', 'org_type', 'org_name',
+            'report_org', 'agency_address', 'contact_person_name',
+            'contact_person_designation', 'contact_person_address',
+            'pin_code', 'active', 'contact_count'
+        ]
+        swagger_schema_name = 'DepartmentList'      # list payload
 
 
 class DepartmentCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,39 @@
+"""
+Department Signals - keep the materialized contact_count in step with contacts
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Department, DepartmentContact
+
+# dept_id was deferred when the contact was loaded, so a move can't be detected
+_NOT_LOADED = object()
+
+
+def bump_contact_count(dept_id, delta):
+    # Single UPDATE, no read; updated_at moves too so list ETags and cached payloads change
+    Department.objects.filter(pk=dept_id).update(
+        contact_count=F('contact_count') + delta,
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=DepartmentContact)
+def count_saved_contact(sender, instance, created, **kwargs):
+    if created:
+        bump_contact_count(instance.dept_id, 1)
+    else:
+        old_dept_id = instance.__dict__.get('_loaded_dept_id', _NOT_LOADED)
+        if old_dept_id is not _NOT_LOADED and old_dept_id != instance.dept_id:
+            bump_contact_count(old_dept_id, -1)
+            bump_contact_count(instance.dept_id, 1)
+        else:
+            # Count unchanged, but the cached department detail renders this contact
+            bump_contact_count(instance.dept_id, 0)
+    instance._loaded_dept_id = instance.dept_id
+
+
+@receiver(post_delete, sender=DepartmentContact)
+def count_deleted_contact(sender, instance, **kwargs):
+    bump_contact_count(instance.dept_id, -1)
@@ -62,6 +62,23 @@ class DepartmentAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data['results']), 1)
 
+    def test_list_departments_not_modified(self):
+        """Test conditional GET on the department list"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get('/api/departments/')
+        etag = response['ETag']
+        response = self.client.get('/api/departments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        DepartmentContact.objects.create(
+            dept=self.department,
+            contact_type="email",
+            contact_value="td@test.com"
+        )
+        response = self.client.get('/api/departments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_retrieve_department(self):
         """Test retrieving a specific department"""
         self.client.force_authenticate(user=self.user)
@@ -138,6 +155,33 @@ class DepartmentAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(DepartmentContact.objects.count(), 0)
 
+    def test_contact_count_follows_contacts(self):
+        """Test the materialized contact_count on create and delete"""
+        contact = DepartmentContact.objects.create(
+            dept=self.department,
+            contact_type="fax",
+            contact_value="0866-123456"
+        )
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.contact_count, 1)
+
+        contact.delete()
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.contact_count, 0)
+
+    def test_contact_count_ignores_deferred_dept(self):
+        """Test saving a contact loaded without dept_id is not counted as a move"""
+        contact = DepartmentContact.objects.create(
+            dept=self.department,
+            contact_type="fax",
+            contact_value="0866-123456"
+        )
+        contact = DepartmentContact.objects.only('contact_value').get(pk=contact.pk)
+        contact.contact_value = "0866-654321"
+        contact.save()
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.contact_count, 1)
+
     def test_search_departments(self):
         """Test searching departments"""
         self.client.force_authenticate(user=self.user)
@@ -5,36 +5,80 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.generics import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+import django_filters
 from rest_framework import filters
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch
+from django.http import Http404
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from backend.mixins import ConditionalListMixin
+from backend.pagination import CappedPageNumberPagination
+from backend.renderers import ORJSONRenderer
+
 from .models import Department, DepartmentContact
 from .serializers import (
     DepartmentSerializer,
+    DepartmentListSerializer,
     DepartmentCreateSerializer,
     DepartmentContactSerializer,
 )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentFilter(django_filters.FilterSet):
+    class Meta:
+        model = Department
+        fields = ['active', 'org_type', 'org_code']
+
+
+class DepartmentViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Departments
     """
-    queryset = Department.objects.prefetch_related('contacts').all()
+    queryset = Department.objects.all()
     permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = CappedPageNumberPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['active', 'org_type', 'org_code']
+    filterset_class = DepartmentFilter
     search_fields = ['org_name', 'org_shortname', 'org_code', 'contact_person_name']
     ordering_fields = ['id', 'org_name', 'org_shortname']
     ordering = ['org_name']
+    # Cached payloads are keyed by updated_at/row counts, so writes never serve stale data
+    list_cache_timeout = 300
+    RETRIEVE_CACHE_TIMEOUT = 300
+    SERIALIZER_MAP = {
+        'list': DepartmentListSerializer,
+        'create': DepartmentCreateSerializer,
+        'update': DepartmentCreateSerializer,
+        'partial_update': DepartmentCreateSerializer,
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            # Only the detail response renders contacts; fetch just the serialized columns
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'contacts',
+                    queryset=DepartmentContact.objects.only(
+                        'id', 'dept', 'contact_type', 'contact_value'
+                    ),
+                )
+            )
+        return queryset
+
+    def get_list_stats(self):
+        # Cheap validator: contact changes bump updated_at through contact_count
+        return Department.objects.aggregate(last_modified=Max('updated_at'), total=Count('id'))
 
     def get_serializer_class(self):
-        if self.action in ['create', 'update', 'partial_update']:
-            return DepartmentCreateSerializer
-        return DepartmentSerializer
+        return self.SERIALIZER_MAP.get(self.action, DepartmentSerializer)
 
     # ------------------------------------------------------------------
     # Standard CRUD (auto-documented with per-method swagger)
@@ -61,7 +105,16 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         tags=['Departments'],
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        # One-column lookup to version the cache key; contact changes bump updated_at too
+        updated_at = get_object_or_404(
+            Department.objects.values_list('updated_at', flat=True), pk=kwargs['pk']
+        )
+        cache_key = f"departments:detail:{kwargs['pk']}:{updated_at.timestamp()}"
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            cache.set(cache_key, data, self.RETRIEVE_CACHE_TIMEOUT)
+        return Response(data)
 
     @swagger_auto_schema(
         operation_summary='Full update of a department',
@@ -106,14 +159,19 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=['get', 'post'], url_path='contacts')
     def list_contacts(self, request, pk=None):
-        department = self.get_object()
-
         if request.method == 'GET':
-            contacts = department.contacts.all()
-            ser = DepartmentContactSerializer(contacts, many=True)
-            return Response(ser.data)
+            # Plain rows straight to the response: no model instances, no serializer walk.
+            # The department itself is only checked for 404s
+            contacts = list(
+                DepartmentContact.objects.filter(dept_id=pk)
+                .values('id', 'contact_type', 'contact_value')
+            )
+            if not contacts and not Department.objects.filter(pk=pk).exists():
+                raise Http404
+            return Response(contacts)
 
         # POST
+        department = self.get_object()
         ser = DepartmentContactSerializer(data=request.data)
         if ser.is_valid():
             ser.save(dept=department)
@@ -142,16 +200,14 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=['delete'], url_path=r'contacts/(?P<contact_id>\d+)')
     def delete_contact(self, request, pk=None, contact_id=None):
-        department = self.get_object()
-        try:
-            contact = DepartmentContact.objects.get(id=contact_id, dept=department)
-            contact.delete()
-            return Response(
-                {'message': 'Contact deleted successfully'},
-                status=status.HTTP_204_NO_CONTENT
-            )
-        except DepartmentContact.DoesNotExist:
+        # Filter on the FK column directly; no department to load first
+        deleted, _ = DepartmentContact.objects.filter(id=contact_id, dept_id=pk).delete()
+        if not deleted:
             return Response(
                 {'error': 'Contact not found'},
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+        return Response(
+            {'message': 'Contact deleted successfully'},
+            status=status.HTTP_204_NO_CONTENT
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from apps.items.models import Item
+from apps.items.signals import refresh_item_attributes
+
+
+class Command(BaseCommand):
+    help = "Rebuild Item.attributes from item_attribute_values (run once after adding the column)"
+
+    def handle(self, *args, **options):
+        updated = refresh_item_attributes(Item.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt attributes for {updated} items"))
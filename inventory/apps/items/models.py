@@ -1,6 +1,7 @@
 """
 Item Models: Item and ItemAttribute
 """
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 
@@ -65,6 +66,11 @@ class Item(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
 
+    # {key: value} copy of attribute_values, maintained by apps.items.signals and
+    # served in place of them; one column read instead of a join per item, and
+    # filterable with attributes__contains
+    attributes = models.JSONField(default=dict, blank=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -72,10 +78,38 @@ class Item(models.Model):
     class Meta:
         db_table = 'items'
         ordering = ['-created_at']
+        indexes = [
+            # Department admins list their dept filtered by status; FKs alone are single-column
+            models.Index(fields=['dept', 'status'], name='items_dept_status_idx'),
+            # Default ordering
+            models.Index(fields=['-created_at'], name='items_created_at_idx'),
+            # Containment lookups on the attribute map
+            GinIndex(fields=['attributes'], opclasses=['jsonb_path_ops'], name='items_attributes_gin'),
+        ]
 
     def __str__(self):
         return f"{self.iteminfo.item_name} - {self.status}"
 
+    def save(self, *args, **kwargs):
+        # attributes is written on INSERT and by the signals' UPDATE only, so a full
+        # save from an instance loaded before a value changed can't put the old map back
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            skipped = self.get_deferred_fields() | {'attributes'}
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the audit log can report changes without re-reading the row
+        loaded = instance.__dict__
+        if 'status' in loaded and 'verified_by_id' in loaded:
+            instance._loaded_state = (loaded['status'], loaded['verified_by_id'])
+        return instance
+
 
 class ItemAttributeValue(models.Model):
     """
@@ -98,6 +132,10 @@ class ItemAttributeValue(models.Model):
     class Meta:
         db_table = 'item_attribute_values'
         ordering = ['item', 'item_attribute']
+        constraints = [
+            # One value per attribute per item; its index also serves the default ordering
+            models.UniqueConstraint(fields=['item', 'item_attribute'], name='uniq_item_attr'),
+        ]
 
     def __str__(self):
         return f"{self.item.id} - {self.item_attribute.key}: {self.value}"
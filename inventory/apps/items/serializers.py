@@ -1,14 +1,66 @@
 """
 Item Serializers
 """
+from collections.abc import Mapping
+
+from django.db import models, transaction
+from django.db.models import F, Func, Value
+from django.db.models.functions import NullIf
+from django.utils.functional import cached_property
+from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
+from backend.serializers import FastModelSerializer, UniqueViolationMixin
 from .models import Item, ItemAttributeValue
 from apps.catalogue.models import ItemAttribute
 
 
-class ItemAttributeValueSerializer(serializers.ModelSerializer):
+BOOLEAN_VALUES = frozenset({'true', 'false', '1', '0'})
+
+
+def validate_number_value(value, item_attribute):
+    try:
+        float(value)
+    except ValueError:
+        raise serializers.ValidationError(
+            f"Value must be a number for attribute {item_attribute.key}"
+        )
+
+
+def validate_boolean_value(value, item_attribute):
+    if value.lower() not in BOOLEAN_VALUES:
+        raise serializers.ValidationError(
+            f"Value must be boolean (true/false) for attribute {item_attribute.key}"
+        )
+
+
+# ItemAttribute.datatype -> value check; datatypes without an entry accept any string
+DATATYPE_VALIDATORS = {
+    'number': validate_number_value,
+    'boolean': validate_boolean_value,
+}
+
+
+class ItemAttributeField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves from context['item_attributes'] when the parent serializer has
+    loaded the payload's attributes up front; otherwise one lookup per value
+    """
+
+    def to_internal_value(self, data):
+        loaded = self.context.get('item_attributes')
+        if loaded and not isinstance(data, bool):
+            try:
+                return loaded[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class ItemAttributeValueSerializer(UniqueViolationMixin, FastModelSerializer):
+    item_attribute = ItemAttributeField(queryset=ItemAttribute.objects.all())
     key = serializers.CharField(source='item_attribute.key', read_only=True)
     datatype = serializers.CharField(source='item_attribute.datatype', read_only=True)
+    unique_violation_error = {'item_attribute': ['This item already has a value for this attribute.']}
 
     class Meta:
         model = ItemAttributeValue
@@ -20,23 +72,25 @@ class ItemAttributeValueSerializer(serializers.ModelSerializer):
         item_attribute = data.get('item_attribute')
         value = data.get('value')
         if item_attribute and value:
-            if item_attribute.datatype == 'number':
-                try:
-                    float(value)
-                except ValueError:
-                    raise serializers.ValidationError(
-                        f"Value must be a number for attribute {item_attribute.key}"
-                    )
-            elif item_attribute.datatype == 'boolean':
-                if value.lower() not in ['true', 'false', '1', '0']:
-                    raise serializers.ValidationError(
-                        f"Value must be boolean (true/false) for attribute {item_attribute.key}"
-                    )
+            validator = DATATYPE_VALIDATORS.get(item_attribute.datatype)
+            if validator is not None:
+                validator(value, item_attribute)
         return data
 
 
-class ItemSerializer(serializers.ModelSerializer):
-    attribute_values = ItemAttributeValueSerializer(many=True, read_only=True)
+class GeocodeCodesSerializer(serializers.Serializer):
+    """Schema of ItemSerializer.geocode_codes"""
+    district_code_ap = serializers.CharField(allow_null=True)
+    mandal_code_ap = serializers.CharField(allow_null=True)
+    village_code_ap = serializers.CharField(allow_null=True)
+
+    class Meta:
+        ref_name = 'GeocodeCodes'                  # drf-yasg component name
+
+
+class ItemSerializer(FastModelSerializer):
+    # Attribute values are rendered from the attributes map; the rows themselves
+    # are listed by the item's attributes endpoint
     iteminfo_name = serializers.CharField(source='iteminfo.item_name', read_only=True)
     iteminfo_category = serializers.CharField(source='iteminfo.category', read_only=True)
     iteminfo_activity_name = serializers.CharField(source='iteminfo.activity_name', read_only=True)
@@ -57,7 +111,7 @@ class ItemSerializer(serializers.ModelSerializer):
             'geocode_codes',
             'dept', 'dept_name', 'dept_short_name', 'user', 'user_name',
             'created_by', 'created_by_name', 'verified_by', 'verified_by_name',
-            'latitude', 'longitude', 'created_at', 'updated_at', 'attribute_values'
+            'latitude', 'longitude', 'created_at', 'updated_at', 'attributes'
         ]
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'verified_by']
         swagger_schema_name = 'Item'               # exact component name
@@ -71,77 +125,212 @@ class ItemSerializer(serializers.ModelSerializer):
             )
         return data
 
-    def get_geocode_name(self, obj):
-        """Return geocode name as 'village, mandal, district' when available."""
+    @staticmethod
+    def geocode_annotations():
+        """
+        Both geocode fields computed by the database, for queryset.annotate()
+        CONCAT_WS skips NULLs, so empty names are dropped as in the Python path
+        """
+        return {
+            '_geocode_id': F('geocode'),
+            '_geocode_name': Func(
+                Value(', '),
+                NullIf('geocode__village_name', Value('')),
+                NullIf('geocode__mandal__mandal_name', Value('')),
+                NullIf('geocode__district__district_name', Value('')),
+                function='CONCAT_WS',
+                output_field=models.CharField(),
+            ),
+            '_district_code_ap': NullIf('geocode__district__district_code_ap', Value('')),
+            '_mandal_code_ap': NullIf('geocode__mandal__mandal_code_ap', Value('')),
+            '_village_code_ap': F('geocode__village_code_ap'),
+        }
+
+    @staticmethod
+    def annotated_geocode_bundle(values):
+        """Geocode fields from geocode_annotations() values (an instance __dict__ or values() row)"""
+        return {
+            'name': values['_geocode_name'] or '',
+            'codes': {
+                'district_code_ap': values['_district_code_ap'],
+                'mandal_code_ap': values['_mandal_code_ap'],
+                'village_code_ap': values['_village_code_ap']
+            },
+        }
+
+    def _geocode_bundle(self, obj):
+        """
+        Read obj.geocode and its mandal/district once for both geocode fields
+        Memoised on the instance, since get_geocode_name and get_geocode_codes
+        run back to back for every row. Instances loaded with
+        geocode_annotations() skip the walk unless their geocode has since changed
+        """
+        bundle = getattr(obj, '_geocode_cache', None)
+        if bundle is not None:
+            return bundle
+
+        if '_geocode_name' in obj.__dict__ and obj._geocode_id == obj.geocode_id:
+            bundle = obj._geocode_cache = self.annotated_geocode_bundle(obj.__dict__)
+            return bundle
+
         geocode = getattr(obj, 'geocode', None)
         if not geocode:
-            return ''
-
-        parts = []
-        village = getattr(geocode, 'village_name', None)
-        if village:
-            parts.append(village)
-
-        # mandal may be a relation on village
-        mandal = getattr(geocode, 'mandal', None)
-        mandal_name = None
-        if mandal:
-            mandal_name = getattr(mandal, 'mandal_name', None)
-        else:
-            # some models may store mandal_name directly
-            mandal_name = getattr(geocode, 'mandal_name', None)
-        if mandal_name:
-            parts.append(mandal_name)
-
-        district = getattr(geocode, 'district', None)
-        district_name = None
-        if district:
-            district_name = getattr(district, 'district_name', None)
+            bundle = {
+                'name': '',
+                'codes': {
+                    'district_code_ap': None,
+                    'mandal_code_ap': None,
+                    'village_code_ap': None
+                },
+            }
         else:
-            district_name = getattr(geocode, 'district_name', None)
-        if district_name:
-            parts.append(district_name)
+            # mandal/district are relations on village; some models store the values directly
+            mandal = getattr(geocode, 'mandal', None)
+            district = getattr(geocode, 'district', None)
+            if mandal:
+                mandal_name = getattr(mandal, 'mandal_name', None)
+                mandal_code = getattr(mandal, 'mandal_code_ap', None)
+            else:
+                mandal_name = getattr(geocode, 'mandal_name', None)
+                mandal_code = None
+            if district:
+                district_name = getattr(district, 'district_name', None)
+                district_code = getattr(district, 'district_code_ap', None)
+            else:
+                district_name = getattr(geocode, 'district_name', None)
+                district_code = None
 
-        return ', '.join(parts)
+            parts = [getattr(geocode, 'village_name', None), mandal_name, district_name]
+            bundle = {
+                'name': ', '.join(part for part in parts if part),
+                'codes': {
+                    'district_code_ap': district_code or getattr(geocode, 'district_code_ap', None),
+                    'mandal_code_ap': mandal_code or getattr(geocode, 'mandal_code_ap', None),
+                    'village_code_ap': getattr(geocode, 'village_code_ap', None)
+                },
+            }
 
+        obj._geocode_cache = bundle
+        return bundle
+
+    @swagger_serializer_method(serializer_or_field=serializers.CharField())
+    def get_geocode_name(self, obj):
+        """Return geocode name as 'village, mandal, district' when available."""
+        return self._geocode_bundle(obj)['name']
+
+    @swagger_serializer_method(serializer_or_field=GeocodeCodesSerializer)
     def get_geocode_codes(self, obj):
         """Return geocode AP codes as a dictionary.
         
         Returns:
             dict: Contains district_code_ap, mandal_code_ap, and village_code_ap
         """
-        geocode = getattr(obj, 'geocode', None)
-        if not geocode:
-            return {
-                'district_code_ap': None,
-                'mandal_code_ap': None,
-                'village_code_ap': None
-            }
+        return self._geocode_bundle(obj)['codes']
 
-        # Get district code
-        district = getattr(geocode, 'district', None)
-        district_code = None
-        if district:
-            district_code = getattr(district, 'district_code_ap', None)
-        if not district_code:
-            district_code = getattr(geocode, 'district_code_ap', None)
-
-        # Get mandal code
-        mandal = getattr(geocode, 'mandal', None)
-        mandal_code = None
-        if mandal:
-            mandal_code = getattr(mandal, 'mandal_code_ap', None)
-        if not mandal_code:
-            mandal_code = getattr(geocode, 'mandal_code_ap', None)
-
-        # Get village code
-        village_code = getattr(geocode, 'village_code_ap', None)
 
-        return {
-            'district_code_ap': district_code,
-            'mandal_code_ap': mandal_code,
-            'village_code_ap': village_code
-        }
+class ItemRowListSerializer(serializers.ListSerializer):
+    """Renders a page of item rows in one represent_rows() pass"""
+
+    def to_representation(self, data):
+        return self.child.represent_rows(list(data))
+
+
+class ItemListSerializer(ItemSerializer):
+    """
+    ItemSerializer output built from queryset.values() rows: no model
+    instances, related rows or per-field attribute walks
+    Feed it the queryset returned by rows(), annotated with
+    geocode_annotations(); each column is formatted by the matching
+    ItemSerializer field, so the payload is unchanged
+    """
+
+    class Meta(ItemSerializer.Meta):
+        swagger_schema_name = 'ItemList'
+        list_serializer_class = ItemRowListSerializer
+
+    @cached_property
+    def _columns(self):
+        """
+        (output key, values() column, formatter, null FK columns) for every
+        readable field, in output order; method fields have no column. A dotted source through a null FK raises SkipField in
+        ItemSerializer, dropping the key, so rows with any of the listed FK
+        columns null leave the key out too
+        """
+        columns = []
+        for field in self._readable_fields:
+            if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+                columns.append((field.field_name, None, None, ()))
+                continue
+            formatter = field.to_representation
+            model_field = None
+            if len(field.source_attrs) == 1:
+                model_field = Item._meta.get_field(field.source_attrs[0])
+            if model_field is not None and model_field.is_relation:
+                # values() already gives the related pk that PrimaryKeyRelatedField renders
+                columns.append((field.field_name, model_field.attname, None, ()))
+                continue
+            if isinstance(model_field, models.FileField):
+                formatter = self._file_formatter(field, model_field)
+            columns.append((
+                field.field_name, '__'.join(field.source_attrs), formatter, self._nullable_hops(field.source_attrs)
+            ))
+        return columns
+
+    @staticmethod
+    def _nullable_hops(source_attrs):
+        """values() columns of the nullable FKs a dotted source passes through"""
+        hops, model, path = [], Item, []
+        for attr in source_attrs[:-1]:
+            relation = model._meta.get_field(attr)
+            if relation.null:
+                hops.append('__'.join(path + [relation.attname]))
+            path.append(attr)
+            model = relation.related_model
+        return tuple(hops)
+
+    @staticmethod
+    def _file_formatter(field, model_field):
+        def to_representation(name):
+            return field.to_representation(model_field.attr_class(None, model_field, name)) if name else None
+        return to_representation
+
+    def rows(self, queryset):
+        """The values() queryset this serializer renders"""
+        columns = {}
+        for _, column, _, null_checks in self._columns:
+            if column is not None:
+                columns[column] = None
+            columns.update(dict.fromkeys(null_checks))
+        return queryset.prefetch_related(None).values(*columns, *self.geocode_annotations())
+
+    def represent_rows(self, rows):
+        """
+        Render a page column by column: each field's formatter runs over every
+        row before the next field, instead of cycling through all fields per row
+        """
+        out = [{} for _ in rows]
+        geocodes = [self.annotated_geocode_bundle(row) for row in rows]
+        for key, column, formatter, null_checks in self._columns:
+            if key == 'geocode_name':
+                values = [geocode['name'] for geocode in geocodes]
+            elif key == 'geocode_codes':
+                values = [geocode['codes'] for geocode in geocodes]
+            elif formatter is None:
+                values = [row[column] for row in rows]
+            else:
+                values = [None if value is None else formatter(value) for value in (row[column] for row in rows)]
+            if null_checks:
+                for ret, row, value in zip(out, rows, values):
+                    if all(row[check] is not None for check in null_checks):
+                        ret[key] = value
+                continue
+            for ret, value in zip(out, values):
+                ret[key] = value
+        return out
+
+    def to_representation(self, row):
+        return self.represent_rows([row])[0]
+
 
 class ItemCreateSerializer(serializers.ModelSerializer):
     attribute_values = ItemAttributeValueSerializer(many=True, required=False)
@@ -163,18 +352,68 @@ class ItemCreateSerializer(serializers.ModelSerializer):
             )
         return data
 
+    def to_internal_value(self, data):
+        if not isinstance(data, Mapping):
+            # Left to super() for DRF's 400 "Invalid data"
+            return super().to_internal_value(data)
+        # Every attribute id in the payload in one query, not one per attribute value
+        attribute_ids = set()
+        attribute_values = data.get('attribute_values')
+        if isinstance(attribute_values, list):
+            for attr_data in attribute_values:
+                attr_id = attr_data.get('item_attribute') if isinstance(attr_data, dict) else None
+                if isinstance(attr_id, int) and not isinstance(attr_id, bool):
+                    attribute_ids.add(attr_id)
+                elif isinstance(attr_id, str) and attr_id.isdigit():
+                    attribute_ids.add(int(attr_id))
+        if attribute_ids:
+            self.context['item_attributes'] = ItemAttribute.objects.in_bulk(attribute_ids)
+        return super().to_internal_value(data)
+
+    def validate_attribute_values(self, value):
+        # Checked here so the uniq_item_attr constraint never fails mid-insert
+        seen = set()
+        for attr_data in value:
+            item_attribute = attr_data.get('item_attribute')
+            attr_id = item_attribute.get('id') if isinstance(item_attribute, dict) else item_attribute.pk
+            if attr_id in seen:
+                raise serializers.ValidationError(
+                    f"Attribute {attr_id} is given more than once"
+                )
+            seen.add(attr_id)
+        return value
+
+    @transaction.atomic
     def create(self, validated_data):
         attributes_data = validated_data.pop('attribute_values', [])
         created_by = self.context['request'].user
-        item = super().create({**validated_data, 'created_by': created_by})
 
+        # Attributes given as {'id': ...} are resolved in one query, not one per row
+        attribute_ids = [
+            attr_data['item_attribute'].get('id')
+            for attr_data in attributes_data
+            if isinstance(attr_data.get('item_attribute'), dict)
+        ]
+        attributes_by_id = ItemAttribute.objects.in_bulk(attribute_ids) if attribute_ids else {}
+        resolved = []
         for attr_data in attributes_data:
             item_attribute = attr_data.get('item_attribute')
             if isinstance(item_attribute, dict):
-                item_attribute = ItemAttribute.objects.get(id=item_attribute.get('id'))
-            ItemAttributeValue.objects.create(
-                item=item, item_attribute=item_attribute, value=attr_data.get('value')
-            )
+                item_attribute = attributes_by_id[item_attribute.get('id')]
+            resolved.append((item_attribute, attr_data.get('value')))
+
+        # bulk_create sends no signals, so the attribute map goes in with the item's own INSERT
+        item = super().create({
+            **validated_data,
+            'created_by': created_by,
+            'attributes': {item_attribute.key: value for item_attribute, value in resolved},
+        })
+        values = [
+            ItemAttributeValue(item=item, item_attribute=item_attribute, value=value)
+            for item_attribute, value in resolved
+        ]
+        # Single multi-row INSERT, in the same transaction as the item
+        ItemAttributeValue.objects.bulk_create(values, batch_size=500)
         return item
 
 
@@ -190,4 +429,15 @@ class ItemVerifySerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 "Cannot transition from 'available' back to 'verified'"
             )
-        return value
\ No newline at end of file
+        return value
+
+    def update(self, instance, validated_data):
+        # Only the verification columns are written; updated_at must be listed for auto_now
+        instance.status = validated_data['status']
+        instance.verified_by = validated_data['verified_by']
+        update_fields = ['status', 'verified_by', 'updated_at']
+        if 'operational_notes' in validated_data:
+            instance.operational_notes = validated_data['operational_notes']
+            update_fields.append('operational_notes')
+        instance.save(update_fields=update_fields)
+        return instance
\ No newline at end of file
@@ -2,14 +2,21 @@
 Item Signals for automatic logging - ENHANCED
 """
 import logging
+import threading
+from django.db.models import Aggregate, JSONField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.db import transaction
-from .models import Item
+from .models import Item, ItemAttributeValue
+from apps.catalogue.models import ItemAttribute, ItemInfo
+from apps.departments.models import Department
 from apps.logs.models import Log
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 @receiver(pre_save, sender=Item)
 def track_item_changes(sender, instance, **kwargs):
@@ -17,12 +24,12 @@ def track_item_changes(sender, instance, **kwargs):
     Track changes before saving to log what fields were modified
     """
     if instance.pk:
-        try:
-            old_instance = Item.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-            instance._old_verified_by = old_instance.verified_by
-        except Item.DoesNotExist:
-            pass
+        # Loaded instances carry their previous state; others read just the two columns
+        old_state = getattr(instance, '_loaded_state', None) or (
+            Item.objects.filter(pk=instance.pk).values_list('status', 'verified_by_id').first()
+        )
+        if old_state:
+            instance._old_status, instance._old_verified_by_id = old_state
 
 
 @receiver(post_save, sender=Item)
@@ -31,19 +38,65 @@ def log_item_save(sender, instance, created, **kwargs):
     Log item creation and updates with error handling
     """
     try:
-        with transaction.atomic():
-            if created:
-                log_item_creation(instance)
-            else:
-                log_item_update(instance)
+        if created:
+            log_item_creation(instance)
+        else:
+            log_item_update(instance)
     except Exception as e:
         logger.error(f"Failed to log item save: {e}", exc_info=True)
+    instance._loaded_state = (instance.status, instance.verified_by_id)
+
+
+class LogBatch(list):
+    """
+    Logs queued during one transaction, written with a single multi-row
+    INSERT when it commits; discarded with it on rollback
+    """
+
+    def __call__(self):
+        if getattr(_pending_logs, 'batch', None) is self:
+            _pending_logs.batch = None
+        try:
+            Log.objects.bulk_create(self, batch_size=1000)
+        except Exception as e:
+            logger.error(f"Failed to write {len(self)} item logs: {e}", exc_info=True)
+
+
+_pending_logs = threading.local()
+
+
+def save_log_on_commit(log):
+    """
+    Write a Log once the surrounding transaction commits
+    The Log is built from the instance at signal time, so only the INSERT is
+    deferred: it stays out of the item's transaction and is skipped entirely
+    if that transaction rolls back. Logs from the same transaction share one
+    LogBatch; outside a transaction the batch is written immediately
+    """
+    connection = transaction.get_connection()
+    savepoint_ids = tuple(connection.savepoint_ids)
+    batch = getattr(_pending_logs, 'batch', None)
+    # Join only a batch registered at the same savepoint depth (so a savepoint
+    # rollback can't keep its logs) and still registered (its transaction
+    # hasn't rolled back)
+    if (
+        batch is not None
+        and batch.savepoint_ids == savepoint_ids
+        and any(callback is batch for _, callback, _ in connection.run_on_commit)
+    ):
+        batch.append(log)
+        return
+
+    batch = _pending_logs.batch = LogBatch([log])
+    batch.savepoint_ids = savepoint_ids
+    transaction.on_commit(batch)
 
 
 def log_item_creation(instance):
     """Log item creation"""
-    user = getattr(instance, 'created_by', None)
-    if not user:
+    # The FK column is enough for the log row; no User fetch
+    user_id = instance.created_by_id
+    if not user_id:
         logger.warning(f"Item {instance.id} created without created_by user")
         return
 
@@ -54,22 +107,22 @@ def log_item_creation(instance):
         'iteminfo_id': instance.iteminfo_id
     }
 
-    Log.objects.create(
-        user=user,
+    save_log_on_commit(Log(
+        user_id=user_id,
         subject_type='Item',
         subject_id=instance.id,
         action='create',
         status='success',
         metadata=metadata
-    )
-    logger.info(f"Item {instance.id} created by user {user.staff_id}")
+    ))
+    logger.info(f"Item {instance.id} created by user {user_id}")
 
 
 def log_item_update(instance):
     """Log item updates with change detection"""
     # Determine who performed the update
-    user = getattr(instance, 'verified_by', None) or getattr(instance, 'created_by', None)
-    if not user:
+    user_id = instance.verified_by_id or instance.created_by_id
+    if not user_id:
         logger.warning(f"Item {instance.id} updated without user context")
         return
 
@@ -80,27 +133,28 @@ def log_item_update(instance):
         'dept_id': instance.dept_id
     }
 
-    # Track specific changes if available
-    if hasattr(instance, '_old_status'):
-        if instance._old_status != instance.status:
-            metadata['status_changed'] = {
-                'from': instance._old_status,
-                'to': instance.status
-            }
+    # Track specific changes if available (set by track_item_changes)
+    state = instance.__dict__
+    old_status = state.get('_old_status', _MISSING)
+    if old_status is not _MISSING and old_status != instance.status:
+        metadata['status_changed'] = {
+            'from': old_status,
+            'to': instance.status
+        }
 
-    if hasattr(instance, '_old_verified_by'):
-        if instance._old_verified_by != instance.verified_by_id:
-            metadata['verification_changed'] = True
+    old_verified_by_id = state.get('_old_verified_by_id', _MISSING)
+    if old_verified_by_id is not _MISSING and old_verified_by_id != instance.verified_by_id:
+        metadata['verification_changed'] = True
 
-    Log.objects.create(
-        user=user,
+    save_log_on_commit(Log(
+        user_id=user_id,
         subject_type='Item',
         subject_id=instance.id,
         action='update',
         status='success',
         metadata=metadata
-    )
-    logger.info(f"Item {instance.id} updated by user {user.staff_id}")
+    ))
+    logger.info(f"Item {instance.id} updated by user {user_id}")
 
 
 @receiver(post_delete, sender=Item)
@@ -109,8 +163,8 @@ def log_item_delete(sender, instance, **kwargs):
     Log item deletion with error handling
     """
     try:
-        user = getattr(instance, 'created_by', None)
-        if not user:
+        user_id = instance.created_by_id
+        if not user_id:
             logger.warning(f"Item {instance.id} deleted without created_by user")
             return
 
@@ -120,20 +174,58 @@ def log_item_delete(sender, instance, **kwargs):
             'iteminfo_id': instance.iteminfo_id
         }
 
-        Log.objects.create(
-            user=user,
+        save_log_on_commit(Log(
+            user_id=user_id,
             subject_type='Item',
             subject_id=instance.id,
             action='delete',
             status='success',
             metadata=metadata
-        )
-        logger.info(f"Item {instance.id} deleted by user {user.staff_id}")
+        ))
+        logger.info(f"Item {instance.id} deleted by user {user_id}")
 
     except Exception as e:
         logger.error(f"Failed to log item deletion: {e}", exc_info=True)
 
 
+class JSONBObjectAgg(Aggregate):
+    function = 'JSONB_OBJECT_AGG'
+    output_field = JSONField()
+
+
+def refresh_item_attributes(items):
+    """
+    Rebuild Item.attributes from attribute_values for the given Item queryset
+    A single UPDATE with a correlated aggregate; no rows are read into Python
+    """
+    attributes = (
+        ItemAttributeValue.objects.filter(item=OuterRef('pk'))
+        .order_by()
+        .values('item')
+        .annotate(attributes=JSONBObjectAgg('item_attribute__key', 'value'))
+        .values('attributes')
+    )
+    return items.update(
+        attributes=Coalesce(Subquery(attributes), Value({}, output_field=JSONField()))
+    )
+
+
+@receiver(post_save, sender=ItemAttributeValue)
+@receiver(post_delete, sender=ItemAttributeValue)
+def sync_item_attributes(sender, instance, origin=None, **kwargs):
+    # Deleting items cascades here once per value; those item rows are going anyway
+    if getattr(origin, 'model', type(origin)) is Item:
+        return
+    refresh_item_attributes(Item.objects.filter(pk=instance.item_id))
+
+
+@receiver(post_save, sender=ItemAttribute)
+def sync_renamed_attribute(sender, instance, created, **kwargs):
+    # The map is keyed by ItemAttribute.key, so a rename rewrites every item holding it
+    if not created:
+        refresh_item_attributes(Item.objects.filter(attribute_values__item_attribute=instance))
+
+
 # Helper functions to safely get related object attributes
 def get_item_name(instance):
     """Safely get item name from related ItemInfo"""
@@ -9,8 +9,11 @@ from apps.departments.models import Department
 from apps.locations.models import District, Mandal, Village
 from apps.catalogue.models import ItemInfo, ItemAttribute
 from apps.items.models import Item, ItemAttributeValue
+from apps.items.serializers import ItemSerializer
+from apps.logs.models import Log
 from apps.rbac.models import Role, Permission, RolePermission
 from apps.users.models import UserRole
+from backend.serializers import eager_loading_lookups
 
 User = get_user_model()
 
@@ -137,13 +140,24 @@ class ItemAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data['results']), 1)
 
+    def test_list_items_matches_item_serializer(self):
+        """Test the values()-based list renders items exactly like ItemSerializer"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/items/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        item = Item.objects.get(pk=self.item.pk)
+        self.assertEqual(response.data['results'][0], ItemSerializer(item).data)
+        # Dotted fields through a null FK are left out, as ItemSerializer does
+        self.assertNotIn('verified_by_name', response.data['results'][0])
+
     def test_retrieve_item(self):
         """Test retrieving a specific item"""
         self.client.force_authenticate(user=self.user)
         response = self.client.get(f'/api/items/{self.item.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['id'], self.item.id)
-        self.assertIn('attribute_values', response.data)
+        self.assertEqual(response.data['attributes'], {"color": "red"})
+        self.assertNotIn('attribute_values', response.data)
 
     def test_create_item(self):
         """Test creating a new item"""
@@ -159,6 +173,32 @@ class ItemAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Item.objects.count(), 2)
 
+    def test_create_item_with_attribute_values(self):
+        """Test creating an item together with its attribute values"""
+        self.client.force_authenticate(user=self.user)
+        size = ItemAttribute.objects.create(item_info=self.item_info, key="size", datatype="string")
+        data = {
+            "iteminfo": self.item_info.id,
+            "dept": self.department.id,
+            "geocode": self.village.id,
+            "attribute_values": [
+                {"item_attribute": self.attribute_definition.id, "value": "green"},
+                {"item_attribute": size.id, "value": "large"},
+            ]
+        }
+        response = self.client.post('/api/items/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        item = Item.objects.exclude(pk=self.item.pk).get()
+        self.assertEqual(item.attributes, {"color": "green", "size": "large"})
+        self.assertEqual(item.attribute_values.count(), 2)
+
+    def test_create_item_with_list_body(self):
+        """Test a non-object body is rejected as invalid data"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/api/items/', [{"iteminfo": self.item_info.id}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Item.objects.count(), 1)
+
     def test_update_item(self):
         """Test updating an item"""
         self.client.force_authenticate(user=self.user)
@@ -215,6 +255,18 @@ class ItemAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(self.item.attribute_values.count(), 2)
 
+    def test_add_duplicate_item_attribute_fails(self):
+        """Test that an item cannot hold two values for one attribute"""
+        self.client.force_authenticate(user=self.user)
+
+        data = {
+            "item_attribute": self.attribute_definition.id,
+            "value": "green"
+        }
+        response = self.client.post(f'/api/items/{self.item.id}/attributes/', data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.item.attribute_values.count(), 1)
+
     def test_update_item_attribute(self):
         """Test updating an item attribute"""
         self.client.force_authenticate(user=self.user)
@@ -236,6 +288,74 @@ class ItemAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(ItemAttributeValue.objects.count(), 0)
 
+    def test_item_attributes_follow_values(self):
+        """Test the attributes map on value save, update and delete"""
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.attributes, {"color": "red"})
+
+        self.attribute_value.value = "blue"
+        self.attribute_value.save()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.attributes, {"color": "blue"})
+
+        self.attribute_value.delete()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.attributes, {})
+
+    def test_item_save_keeps_attributes(self):
+        """Test a full save from a stale instance does not write back its attributes map"""
+        stale = Item.objects.get(pk=self.item.pk)
+        self.attribute_value.value = "blue"
+        self.attribute_value.save()
+
+        stale.operational_notes = "Checked"
+        stale.save()
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.operational_notes, "Checked")
+        self.assertEqual(self.item.attributes, {"color": "blue"})
+
+    def test_filter_items_by_attribute(self):
+        """Test filtering items by an attribute value"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/items/', {'attribute': 'color:red'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+        response = self.client.get('/api/items/', {'attribute': 'color:green'})
+        self.assertEqual(len(response.data['results']), 0)
+
+    def test_item_serializer_eager_loading(self):
+        """Test relations are joined and attribute values are not prefetched"""
+        select, prefetch = eager_loading_lookups(ItemSerializer, Item)
+        self.assertIn('iteminfo', select)
+        self.assertIn('geocode', select)
+        self.assertEqual(prefetch, ())
+
+    def test_item_logs_written_on_commit(self):
+        """Test item logs from one transaction are written together on commit"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.item.operational_notes = "Checked"
+            self.item.save()
+            self.item.status = "available"
+            self.item.save()
+            self.assertFalse(Log.objects.filter(subject_id=self.item.id).exists())
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            Log.objects.filter(subject_type='Item', subject_id=self.item.id, action='update').count(), 2
+        )
+
+    def test_item_log_records_status_change(self):
+        """Test the update log reports the status change of a loaded item"""
+        item = Item.objects.get(pk=self.item.pk)
+        item.status = "available"
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save()
+
+        log = Log.objects.get(subject_type='Item', subject_id=item.id, action='update')
+        self.assertEqual(log.metadata['status_changed'], {'from': 'pending', 'to': 'available'})
+        self.assertNotIn('verification_changed', log.metadata)
+
     def test_filter_items_by_status(self):
         """Test filtering items by status"""
         self.client.force_authenticate(user=self.user)
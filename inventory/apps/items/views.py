@@ -6,6 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+import django_filters
 from rest_framework import filters
 
 from drf_yasg.utils import swagger_auto_schema
@@ -14,23 +15,40 @@ from drf_yasg import openapi
 from .models import Item, ItemAttributeValue
 from .serializers import (
     ItemSerializer,
+    ItemListSerializer,
     ItemCreateSerializer,
     ItemAttributeValueSerializer,
     ItemVerifySerializer,
 )
 from apps.rbac.permissions import has_permission, require_scope_access
+from backend.mixins import EagerLoadingMixin
 
 
-class ItemViewSet(viewsets.ModelViewSet):
-    queryset = Item.objects.select_related(
-        'iteminfo', 'dept', 'geocode', 'user', 'created_by', 'verified_by'
-    ).prefetch_related('attribute_values').all()
+class ItemFilter(django_filters.FilterSet):
+    # ?attribute=key:value is a containment (@>) lookup served by the attributes GIN index
+    attribute = django_filters.CharFilter(method='filter_attribute')
+
+    class Meta:
+        model = Item
+        fields = [
+            'status', 'dept', 'geocode', 'iteminfo',
+            'geocode__district', 'geocode__mandal', 'created_by', 'verified_by'
+        ]
+
+    def filter_attribute(self, queryset, name, value):
+        key, sep, attr_value = value.partition(':')
+        if not sep:
+            return queryset.filter(attributes__has_key=key)
+        return queryset.filter(attributes__contains={key: attr_value})
+
+
+class ItemViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+    queryset = Item.objects.all()
+    # Actions that render items; their queryset carries the geocode field annotations
+    SERIALIZING_ACTIONS = {'list', 'retrieve', 'update', 'partial_update', 'verify_item'}
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = [
-        'status', 'dept', 'geocode', 'iteminfo',
-        'geocode__district', 'geocode__mandal', 'created_by', 'verified_by'
-    ]
+    filterset_class = ItemFilter
     search_fields = [
         'iteminfo__item_name', 'iteminfo__item_code',
         'operational_notes', 'dept__org_name'
@@ -39,6 +57,8 @@ class ItemViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_serializer_class(self):
+        if self.action == 'list':
+            return ItemListSerializer
         return ItemCreateSerializer if self.action == 'create' else ItemSerializer
 
     def get_queryset(self):
@@ -47,6 +67,8 @@ class ItemViewSet(viewsets.ModelViewSet):
         and by department for Department Admins
         """
         queryset = super().get_queryset()
+        if self.action in self.SERIALIZING_ACTIONS:
+            queryset = queryset.annotate(**ItemSerializer.geocode_annotations())
 
         # Superusers see everything
         if self.request.user.is_superuser:
@@ -94,7 +116,14 @@ class ItemViewSet(viewsets.ModelViewSet):
     )
     @has_permission("view_items")
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Filtered, ordered and paginated as values() rows; see ItemListSerializer
+        serializer = self.get_serializer()
+        queryset = serializer.rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
 
     @swagger_auto_schema(
         operation_summary='Create a new item',
@@ -171,14 +200,10 @@ class ItemViewSet(viewsets.ModelViewSet):
     @has_permission("verify_items")
     def verify_item(self, request, pk=None):
         item = self.get_object()
-        serializer = ItemVerifySerializer(data=request.data, context={'item': item})
+        serializer = ItemVerifySerializer(item, data=request.data, context={'item': item})
 
         if serializer.is_valid():
-            item.status = serializer.validated_data['status']
-            if 'operational_notes' in serializer.validated_data:
-                item.operational_notes = serializer.validated_data['operational_notes']
-            item.verified_by = request.user
-            item.save()
+            serializer.save(verified_by=request.user)
             return Response(ItemSerializer(item).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
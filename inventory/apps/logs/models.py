@@ -44,7 +44,8 @@ class Log(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['subject_type', 'subject_id']),
+            # A subject's history in the default newest-first order, without a sort step
+            models.Index(fields=['subject_type', 'subject_id', '-created_at']),
             models.Index(fields=['-created_at']),
         ]
 
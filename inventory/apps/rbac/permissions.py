@@ -40,6 +40,32 @@ class HasPermission(permissions.BasePermission):
         return False
 
 
+class HasActionPermission(permissions.BasePermission):
+    """
+    Permission class driven by a per-view ``action_permissions`` map
+    Usage:
+        permission_classes = [IsAuthenticated, HasActionPermission]
+        action_permissions = {'list': 'view_items', 'create': 'create_items'}
+    Actions missing from the map are not restricted beyond the other classes.
+    """
+    def has_permission(self, request, view):
+        permission_name = getattr(view, 'action_permissions', {}).get(view.action)
+        if permission_name is None:
+            return True
+
+        if not request.user or not request.user.is_authenticated:
+            return False
+
+        if request.user.is_superuser:
+            return True
+
+        if permission_name in get_request_permissions(request):
+            return True
+
+        self.message = f'Permission denied. Required permission: {permission_name}'
+        return False
+
+
 def has_permission(permission_name):
     """
     Decorator to check if user has specific permission
@@ -62,18 +88,9 @@ def has_permission(permission_name):
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
-            # Get user's roles
-            from apps.users.models import UserRole
-            user_roles = UserRole.objects.filter(user=request.user).select_related('role')
-
-            # Check if any of the user's roles have the required permission
-            for user_role in user_roles:
-                has_perm = RolePermission.objects.filter(
-                    role=user_role.role,
-                    permission__name=permission_name
-                ).exists()
-                if has_perm:
-                    return func(self, request, *args, **kwargs)
+            # Permission names are loaded once per request and reused
+            if permission_name in get_request_permissions(request):
+                return func(self, request, *args, **kwargs)
 
             return Response(
                 {'error': f'Permission denied. Required permission: {permission_name}'},
@@ -83,6 +100,22 @@ def has_permission(permission_name):
     return decorator
 
 
+def get_request_permissions(request):
+    """
+    Return the set of permission names granted to request.user
+    Computed with a single query on first use and cached on the request,
+    so several checks within one request share the lookup
+    """
+    permission_names = getattr(request, '_rbac_permission_names', None)
+    if permission_names is None:
+        permission_names = frozenset(
+            RolePermission.objects.filter(role__role_users__user=request.user)
+            .values_list('permission__name', flat=True)
+        )
+        request._rbac_permission_names = permission_names
+    return permission_names
+
+
 def check_user_permission(user, permission_name):
     """
     Helper function to check if a user has a specific permission
@@ -92,20 +125,11 @@ def check_user_permission(user, permission_name):
     if user.is_superuser:
         return True
 
-    # Get user's roles
-    from apps.users.models import UserRole
-    user_roles = UserRole.objects.filter(user=user).select_related('role')
-
-    # Check if any of the user's roles have the required permission
-    for user_role in user_roles:
-        has_perm = RolePermission.objects.filter(
-            role=user_role.role,
-            permission__name=permission_name
-        ).exists()
-        if has_perm:
-            return True
-
-    return False
+    # One query across all of the user's roles
+    return RolePermission.objects.filter(
+        role__role_users__user=user,
+        permission__name=permission_name
+    ).exists()
 
 
 def get_user_roles(user):
@@ -0,0 +1,16 @@
+"""
+Shared helpers for the CSV import management commands
+"""
+
+
+def header_positions(raw_header, required):
+    """
+    Map each header name, stripped of whitespace, to its column position
+    Resolved once per file, so data rows can be read as plain lists;
+    raises ValueError naming any required columns the header lacks
+    """
+    positions = {name.strip(): i for i, name in enumerate(raw_header)}
+    missing = set(required) - positions.keys()
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    return positions
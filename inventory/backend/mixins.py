@@ -0,0 +1,75 @@
+"""
+Shared DRF viewset mixins
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .serializers import eager_loading_lookups
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET for list endpoints
+    get_list_stats() returns a cheap aggregate whose values change whenever
+    the listed rows do; its 'last_modified' key also feeds Last-Modified.
+    A matching If-None-Match answers 304 without running the list query,
+    the serializer or the renderer. With list_cache_timeout set, the
+    serialized page is also kept in the cache under the same fingerprint,
+    so other clients skip the query and serializer too
+    """
+    list_cache_timeout = None
+
+    def get_list_stats(self):
+        raise NotImplementedError('ConditionalListMixin requires get_list_stats()')
+
+    def list(self, request, *args, **kwargs):
+        stats = self.get_list_stats()
+        fingerprint = ':'.join(
+            [str(value) for value in stats.values()]
+            + [request.get_full_path(), request.accepted_renderer.format]
+        )
+        digest = hashlib.md5(fingerprint.encode()).hexdigest()
+        etag = f'"{digest}"'
+
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        if self.list_cache_timeout:
+            # Host is part of the key because pagination links are absolute
+            cache_key = f'list:{type(self).__name__}:{request.get_host()}:{digest}'
+            data = cache.get(cache_key)
+            if data is None:
+                data = super().list(request, *args, **kwargs).data
+                cache.set(cache_key, data, self.list_cache_timeout)
+            response = Response(data)
+        else:
+            response = super().list(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        if stats.get('last_modified'):
+            response['Last-Modified'] = http_date(stats['last_modified'].timestamp())
+        return response
+
+
+class EagerLoadingMixin:
+    """
+    Applies select_related/prefetch_related derived from the serializer in
+    use, so a new dotted source or nested serializer never adds an N+1.
+    Relations read inside SerializerMethodFields go in extra_select_related
+    """
+    extra_select_related = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select, prefetch = eager_loading_lookups(self.get_serializer_class(), queryset.model)
+        # Prefetch querysets are built per call; only the lookup plan is cached
+        prefetches = [
+            Prefetch(path, queryset=model._default_manager.select_related(*related)) if related else path
+            for path, model, related in prefetch
+        ]
+        return queryset.select_related(*select, *self.extra_select_related).prefetch_related(*prefetches)
@@ -0,0 +1,14 @@
+"""
+Shared DRF pagination classes
+"""
+from rest_framework.pagination import PageNumberPagination
+
+
+class CappedPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination with a client-selectable but bounded page size,
+    so no request can serialize an unbounded number of rows
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
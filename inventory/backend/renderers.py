@@ -0,0 +1,25 @@
+"""
+Shared DRF renderers
+"""
+import orjson
+from rest_framework import encoders
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for DRF's JSONRenderer backed by orjson
+    Types orjson does not handle natively (Decimal, lazy strings, ...)
+    fall back to DRF's JSONEncoder
+    """
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self._default, option=option)
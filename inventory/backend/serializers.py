@@ -0,0 +1,133 @@
+"""
+Shared DRF serializers
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, transaction
+from django.utils.functional import cached_property
+from psycopg2.errorcodes import UNIQUE_VIOLATION
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+class FastModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer with a cheaper to_representation for list endpoints
+    Fields backed directly by a concrete, non-relational model column are
+    read with a precomputed attrgetter instead of DRF's generic
+    get_attribute (source walk + callable check) on every object
+    """
+
+    @cached_property
+    def _fast_fields(self):
+        model = self.Meta.model
+        fast_fields = []
+        for field in self._readable_fields:
+            getter = None
+            if field.source != '*' and len(field.source_attrs) == 1:
+                try:
+                    model_field = model._meta.get_field(field.source_attrs[0])
+                except FieldDoesNotExist:
+                    model_field = None
+                if model_field is not None and model_field.concrete and not model_field.is_relation:
+                    getter = attrgetter(model_field.attname)
+            fast_fields.append((field, getter))
+        return fast_fields
+
+    def to_representation(self, instance):
+        ret = {}
+        for field, getter in self._fast_fields:
+            if getter is not None:
+                attribute = getter(instance)
+            else:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                ret[field.field_name] = None
+            else:
+                ret[field.field_name] = field.to_representation(attribute)
+        return ret
+
+
+class UniqueViolationMixin:
+    """
+    Let the database enforce uniqueness instead of a pre-insert SELECT,
+    turning the resulting unique violation into a 400
+    Other integrity errors (foreign key, NOT NULL, check) are re-raised
+    """
+    unique_violation_error = None
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            self._raise_unique_violation(e)
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as e:
+            self._raise_unique_violation(e)
+
+    def _raise_unique_violation(self, error):
+        if getattr(error.__cause__, 'pgcode', None) != UNIQUE_VIOLATION:
+            raise error
+        raise serializers.ValidationError(self.unique_violation_error) from error
+
+
+@lru_cache(maxsize=None)
+def eager_loading_lookups(serializer_class, model):
+    """
+    Return (select_related, prefetch_related) lookups covering every relation
+    a serializer reads through dotted sources or nested serializers
+    Prefetch lookups are (path, model, select_related) triples: forward
+    relations read below a to-many hop are joined into that prefetch's own
+    query instead of costing another query each
+    SerializerMethodFields are opaque and must be covered by the caller
+    """
+    select, prefetch = set(), {}
+    _collect_lookups(serializer_class(), model, [], None, select, prefetch)
+    return tuple(sorted(select)), tuple(
+        (path, prefetch_model, tuple(sorted(related)))
+        for path, (prefetch_model, related) in sorted(prefetch.items())
+    )
+
+
+def _collect_lookups(serializer, model, base, root, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        nested = isinstance(field, serializers.BaseSerializer)
+        # A nested serializer reads its whole source; a plain field only the relations before its attribute
+        attrs = field.source_attrs if nested else field.source_attrs[:-1]
+        current, path, field_root = model, list(base), root
+        for attr in attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            path.append(attr)
+            current = model_field.related_model
+            if model_field.one_to_many or model_field.many_to_many:
+                field_root = '__'.join(path)
+                prefetch.setdefault(field_root, (current, set()))
+            elif field_root is not None:
+                prefetch[field_root][1].add('__'.join(path)[len(field_root) + 2:])
+            else:
+                select.add('__'.join(path))
+        else:
+            if nested and path:
+                child = getattr(field, 'child', field)
+                _collect_lookups(child, current, path, field_root, select, prefetch)
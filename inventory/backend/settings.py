@@ -56,6 +56,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -79,6 +80,8 @@ INSTALLED_APPS = [
 # ---------------------------------------------------------------------
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Serves collectstatic output when DEBUG is off (admin, Swagger UI, browsable API)
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -125,6 +128,9 @@ DATABASES = {
         "HOST": tmpPostgres.hostname,
         "PORT": tmpPostgres.port or 5432,
         "OPTIONS": dict(parse_qsl(tmpPostgres.query)),
+        # Reuse connections across requests/import batches instead of reconnecting
+        "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -170,7 +176,7 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.CappedPageNumberPagination",
     "PAGE_SIZE": 50,
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -260,3 +266,5 @@ SWAGGER_SETTINGS = {
     "DEFAULT_API_URL": config("SWAGGER_DEFAULT_API_URL", default="http://localhost:8000"),
     "SUPPORTED_SUBMIT_METHODS": ["get", "post", "put", "patch", "delete"],
 }
+# The schema is public and only changes on deploy; regenerate it on every hit in DEBUG only
+SWAGGER_CACHE_TIMEOUT = config("SWAGGER_CACHE_TIMEOUT", default=0 if DEBUG else 3600, cast=int)
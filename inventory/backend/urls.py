@@ -28,8 +28,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
 
     # API Documentation
-    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=settings.SWAGGER_CACHE_TIMEOUT), name='schema-swagger-ui'),
+    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=settings.SWAGGER_CACHE_TIMEOUT), name='schema-redoc'),
 
     # App URLs
     path('api/auth/', include('apps.users.urls')),